@@ -9,16 +9,126 @@ __all__ = [
     'load_aliases',
 ]
 
+import copy
+import csv
 from datetime import datetime
+from functools import lru_cache
+import gc
+import os
+import pickle
+import sys
+
 from astropy.io import ascii
 import numpy as np
 import prompt_toolkit as ptk
 
-from ..utils import ROOT
+from ..utils import ROOT, _write_atomic
+from ..version import __version__
 from . import utils as u
 from .target import Target
 
 
+# Parsed Catalog data, invalidated when any of the source files change
+_CATALOG_CACHE = f'{ROOT}data/catalog_cache.pickle'
+_CATALOG_SOURCES = [
+    'nea_data.txt',
+    'tess_data.txt',
+    'trexolists.csv',
+    'target_aliases.txt',
+]
+
+
+def _catalog_cache_key():
+    mtimes = tuple(
+        os.path.getmtime(f'{ROOT}data/{file}')
+        for file in _CATALOG_SOURCES
+    )
+    return __version__, mtimes
+
+
+def _load_catalog_cache():
+    """
+    Load the Catalog data from the cache file, return None if
+    there is no cache or it is outdated.
+    """
+    # Pause garbage collection while unpickling (many small objects)
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        with open(_CATALOG_CACHE, 'rb') as handle:
+            key, data = pickle.load(handle)
+    except Exception:
+        return None
+    finally:
+        if gc_enabled:
+            gc.enable()
+    if key != _catalog_cache_key():
+        return None
+    return data
+
+
+def _save_catalog_cache(data):
+    cache = _catalog_cache_key(), data
+    _write_atomic(
+        _CATALOG_CACHE,
+        lambda handle: pickle.dump(
+            cache, handle, protocol=pickle.HIGHEST_PROTOCOL,
+        ),
+    )
+
+
+def _parse_catalog():
+    """
+    Parse the catalog files into a dictionary of Catalog attributes.
+    """
+    # Confirmed planets and TESS candidates
+    nea_targets = load_targets('nea_data.txt', is_confirmed=True)
+    tess_targets = load_targets('tess_data.txt', is_confirmed=False)
+    targets = nea_targets + tess_targets
+
+    # JWST targets
+    trexo_data = load_trexolists(grouped=True)
+    host_aliases = load_aliases('host')
+
+    # Map each NEA host to its (first) trexolists group:
+    jwst_index = {}
+    for j, jwst_target in enumerate(trexo_data):
+        hosts = np.unique([
+            host_aliases.get(host, host)
+            for host in jwst_target['target']
+        ])
+        jwst_target['nea_hosts'] = hosts
+        for host in hosts:
+            jwst_index.setdefault(host, j)
+
+    # Flags as NumPy columns (one entry per target):
+    hosts = np.array([target.host for target in targets])
+    transit_dur = np.array([target.transit_dur for target in targets])
+    transit_mask = np.isfinite(transit_dur)
+    jwst_mask = np.isin(hosts, list(jwst_index)) & transit_mask
+    confirmed_mask = np.repeat(
+        [True, False], [len(nea_targets), len(tess_targets)],
+    )
+
+    planet_aliases = load_aliases('planet')
+    planets_aka = u.invert_aliases(planet_aliases)
+
+    for target,is_jwst in zip(targets, jwst_mask.tolist()):
+        target.is_jwst = is_jwst
+        if is_jwst:
+            target.trexo_data = trexo_data[jwst_index[target.host]]
+
+        if target.planet in planets_aka:
+            target.aliases = planets_aka[target.planet]
+    catalog = {
+        'targets': targets,
+        '_transit_mask': transit_mask,
+        '_jwst_mask': jwst_mask,
+        '_confirmed_mask': confirmed_mask,
+    }
+    return catalog
+
+
 def find_target(targets=None):
     """
     Interactive prompt with tab-completion to search for targets.
@@ -34,14 +144,16 @@ def find_target(targets=None):
     """
     if targets is None:
         targets = load_targets('nea_data.txt', is_confirmed=True)
-    planets = [target.planet for target in targets]
-    aliases = []
+    # Name lookups (first match wins, aliases take precedence):
+    planets = {}
+    aliases = {}
     for target in targets:
-        aliases += target.aliases
-    planets += list(aliases)
+        planets.setdefault(target.planet, target)
+        for alias in target.aliases:
+            aliases.setdefault(alias, target)
 
     completer = ptk.completion.WordCompleter(
-        planets,
+        list(planets) + list(aliases),
         sentence=True,
         match_middle=True,
     )
@@ -54,13 +166,8 @@ def find_target(targets=None):
         complete_while_typing=False,
     )
     if name in aliases:
-        for target in targets:
-            if name in target.aliases:
-                return target
-    if name in planets:
-        return targets[planets.index(name)]
-
-    return None
+        return aliases[name]
+    return planets.get(name)
 
 
 class Catalog():
@@ -73,44 +180,18 @@ class Catalog():
     >>> catalog = cat.Catalog()
     """
     def __init__(self):
-        # Confirmed planets and TESS candidates
-        nea_targets = load_targets('nea_data.txt', is_confirmed=True)
-        tess_targets = load_targets('tess_data.txt', is_confirmed=False)
-        self.targets = nea_targets + tess_targets
-
-        # JWST targets
-        trexo_data = load_trexolists(grouped=True)
-        njwst = len(trexo_data)
-        host_aliases = load_aliases('host')
-
-        jwst_hosts = []
-        for jwst_target in trexo_data:
-            hosts = np.unique([
-                host_aliases[host] if host in host_aliases else host
-                for host in jwst_target['target']
-            ])
-            jwst_target['nea_hosts'] = hosts
-            jwst_hosts += list(hosts)
-        jwst_hosts = np.unique(jwst_hosts)
-
-        planet_aliases = load_aliases('planet')
-        planets_aka = u.invert_aliases(planet_aliases)
-
-        for target in self.targets:
-            target.is_jwst = target.host in jwst_hosts and target.is_transiting
-            if target.is_jwst:
-                for j in range(njwst):
-                    if target.host in trexo_data[j]['nea_hosts']:
-                        break
-                target.trexo_data = trexo_data[j]
-
-            if target.planet in planets_aka:
-                target.aliases = planets_aka[target.planet]
-
-        self._transit_mask = [target.is_transiting for target in self.targets]
-        self._jwst_mask = [target.is_jwst for target in self.targets]
-        self._confirmed_mask = [target.is_confirmed for target in self.targets]
-
+        # Parse catalog files or load them from cache if up to date
+        cache = _load_catalog_cache()
+        if cache is None:
+            cache = _parse_catalog()
+            _save_catalog_cache(cache)
+        self.__dict__.update(cache)
+
+        # Index of targets known by each planet name or alias:
+        self._name_index = {}
+        for i,target in enumerate(self.targets):
+            for name in dict.fromkeys([target.planet] + target.aliases):
+                self._name_index.setdefault(name, []).append(i)
 
     def get_target(
             self, name=None,
@@ -142,21 +223,19 @@ class Catalog():
         """
         mask = np.ones(len(self.targets), bool)
         if is_transit is not None:
-            mask &= np.array(self._transit_mask) == is_transit
+            mask &= self._transit_mask == is_transit
         if is_jwst is not None:
-            mask &= np.array(self._jwst_mask) == is_jwst
+            mask &= self._jwst_mask == is_jwst
         if is_confirmed is not None:
-            mask &= np.array(self._confirmed_mask) == is_confirmed
-
-        targets = [target for target,flag in zip(self.targets,mask) if flag]
+            mask &= self._confirmed_mask == is_confirmed
 
         if name is None:
+            targets = [target for target,flag in zip(self.targets,mask) if flag]
             return find_target(targets)
 
-        target = u.normalize_name(name)
-        for target in targets:
-            if name == target.planet or name in target.aliases:
-                return target
+        for i in self._name_index.get(name, []):
+            if mask[i]:
+                return self.targets[i]
 
     def show_target(
             self, name=None,
@@ -184,43 +263,99 @@ def load_targets(database='nea_data.txt', is_confirmed=np.nan):
     Examples
     --------
     >>> import gen_tso.catalogs as cat
-    >>> nea_data = cat.load_nea_targets_table()
+    >>> nea_data = cat.load_targets('nea_data.txt')
+    """
+    file = f'{ROOT}data/{database}'
+    stat = os.stat(file)
+    file_stamp = stat.st_mtime_ns, stat.st_size
+    targets = _load_targets(file, file_stamp, is_confirmed)
+    # Hand out copies, the cached Target objects must not be modified
+    return [copy.copy(target) for target in targets]
+
+
+@lru_cache(maxsize=4)
+def _load_targets(file, file_stamp, is_confirmed):
     """
-    # database = 'new_nea_data.txt'
-    with open(f'{ROOT}data/{database}', 'r') as f:
+    Parse a targets file into a tuple of Target objects.
+    Memoized by file and its (modification time, size) stamp, so
+    repeated calls within a session only parse each unchanged file once.
+    """
+    with open(file, 'r') as f:
         lines = f.readlines()
 
-    lines = [
-        line for line in lines
-        if not line.strip().startswith('#')
-    ]
-    targets = []
+    # Split star and planet entries, tracking the host of each planet:
+    star_lines = []
+    planet_lines = []
+    host_index = []
     for line in lines:
+        if line.strip().startswith('#'):
+            continue
         if line.startswith('>'):
-            name_len = line.find(':')
-            host = line[1:name_len]
-            star_vals = np.array(line[name_len+1:].split(), float)
-            ra, dec, ks_mag, rstar, mstar, teff, logg, metal = star_vals
+            star_lines.append(line)
         elif line.startswith(' '):
-            name_len = line.find(':')
-            planet = line[1:name_len].strip()
-            planet_vals = np.array(line[name_len+1:].split(), float)
-            t_dur, rplanet, mplanet, sma, period, teq, min_mass = planet_vals
-
-            target = Target(
-                host=host,
-                mstar=mstar, rstar=rstar, teff=teff, logg_star=logg,
-                metal_star=metal,
-                ks_mag=ks_mag, ra=ra, dec=dec,
-                planet=planet,
-                mplanet=mplanet, rplanet=rplanet,
-                period=period, sma=sma, transit_dur=t_dur,
-                is_confirmed=is_confirmed,
-                is_min_mass=bool(min_mass),
-            )
-            targets.append(target)
-
-    return targets
+            planet_lines.append(line)
+            host_index.append(len(star_lines)-1)
+
+    # Parse all numeric values at once:
+    hosts, star_vals = _split_entries(star_lines, ncols=8)
+    planets, planet_vals = _split_entries(planet_lines, ncols=7)
+
+    targets = []
+    for i,planet in enumerate(planets):
+        k = host_index[i]
+        ra, dec, ks_mag, rstar, mstar, teff, logg, metal = star_vals[k]
+        t_dur, rplanet, mplanet, sma, period, teq, min_mass = planet_vals[i]
+        target = Target(
+            host=hosts[k],
+            mstar=mstar, rstar=rstar, teff=teff, logg_star=logg,
+            metal_star=metal,
+            ks_mag=ks_mag, ra=ra, dec=dec,
+            planet=planet,
+            mplanet=mplanet, rplanet=rplanet,
+            period=period, sma=sma, transit_dur=t_dur,
+            is_confirmed=is_confirmed,
+            is_min_mass=bool(min_mass),
+        )
+        targets.append(target)
+
+    return tuple(targets)
+
+
+def _split_entries(lines, ncols):
+    """
+    Split 'name: values' catalog lines into a list of names and
+    a 2D float array of values with shape [nlines, ncols].
+    """
+    names = []
+    values = []
+    for line in lines:
+        name_len = line.find(':')
+        # Interned, so that names shared across catalogs share one object
+        names.append(sys.intern(line[1:name_len].strip()))
+        values.append(line[name_len+1:])
+    values = np.array(' '.join(values).split(), float).reshape(-1, ncols)
+    return names, values
+
+
+def _load_trexolists_names(trexo_file=None):
+    """
+    Get the (normalized) target names from the trexolists.csv file.
+    Same as load_trexolists()['target'], without parsing the
+    rest of the table.
+    """
+    if trexo_file is None:
+        trexo_file = f'{ROOT}data/trexolists.csv'
+
+    with open(trexo_file, newline='') as f:
+        reader = csv.reader(line for line in f if not line.startswith('#'))
+        header = next(reader)
+        itarget = header.index('Target')
+        names = [
+            u.normalize_name(row[itarget])
+            for row in reader
+            if len(row) > itarget
+        ]
+    return names
 
 
 def load_trexolists(grouped=False, trexo_file=None):
@@ -281,7 +416,7 @@ def load_trexolists(grouped=False, trexo_file=None):
 
     trexolist_data = ascii.read(
         trexo_file,
-        format='csv', guess=False, fast_reader=False, comment='#',
+        format='csv', guess=False, fast_reader=True, comment='#',
     )
 
     norm_targets = np.array([
@@ -367,36 +502,29 @@ def load_trexolists(grouped=False, trexo_file=None):
         return trexo_data
 
     # Use RA and dec to detect aliases for a same object
-    truncated_ra = np.array([ra[0:5] for ra in trexo_data['ra']])
-    truncated_dec = np.array([dec[0:6] for dec in trexo_data['dec']])
-
+    # (casting to a shorter string dtype truncates in C)
     ntargets = len(trexo_data['target'])
-    taken = np.zeros(ntargets, bool)
-    target_sets = []
-    trexo_ra = []
-    trexo_dec = []
-    for i in range(ntargets):
-        if taken[i]:
-            continue
-        group_indices = [i]
-        ra = truncated_ra[i]
-        dec = truncated_dec[i]
-        trexo_ra.append(ra)
-        trexo_dec.append(dec)
-        taken[i] = True
-        for j in range(i,ntargets):
-            if truncated_ra[j]==ra and truncated_dec[j]==dec and not taken[j]:
-                group_indices.append(j)
-                taken[j] = True
-        target_sets.append(group_indices)
+    coords = np.empty(ntargets, dtype=[('ra', '<U5'), ('dec', '<U6')])
+    coords['ra'] = trexo_data['ra']
+    coords['dec'] = trexo_data['dec']
+
+    _, first, inverse = np.unique(
+        coords, return_index=True, return_inverse=True,
+    )
+    inverse = inverse.ravel()
+    # Indices of each group, sorted by position in the trexolists file
+    isort = np.argsort(inverse, kind='stable')
+    group_end = np.cumsum(np.bincount(inverse, minlength=len(first)))
+    target_sets = np.split(isort, group_end[:-1])
 
     grouped_data = []
-    for i,indices in enumerate(target_sets):
+    for group in np.argsort(first):
+        indices = target_sets[group]
         target = {}
         for key in trexo_data.keys():
             target[key] = trexo_data[key][indices]
-        target['truncated_ra'] = np.array(trexo_ra[i])
-        target['truncated_dec'] = np.array(trexo_dec[i])
+        target['truncated_ra'] = np.array(coords['ra'][indices[0]])
+        target['truncated_dec'] = np.array(coords['dec'][indices[0]])
         grouped_data.append(target)
 
     return grouped_data
@@ -486,13 +614,22 @@ def load_aliases(style='planet', aliases_file=None):
     with open(aliases_file, 'r') as f:
         lines = f.readlines()
 
-    if style != 'system':
+    if style == 'planet':
+        # Planet names need no parsing
         aliases = {}
         for line in lines:
-            loc = line.index(':')
-            name = parse(line[:loc], style)
-            for alias in line[loc+1:].strip().split(','):
-                aliases[parse(alias,style)] = name
+            name, _, names = line.partition(':')
+            aliases.update(dict.fromkeys(names.strip().split(','), name))
+            aliases[name] = name
+        return aliases
+
+    if style == 'host':
+        aliases = {}
+        for line in lines:
+            name, _, names = line.partition(':')
+            name = sys.intern(parse(name, style))
+            for alias in names.strip().split(','):
+                aliases[parse(alias, style)] = name
             aliases[name] = name
         return aliases
 
@@ -502,15 +639,11 @@ def load_aliases(style='planet', aliases_file=None):
         loc = line.index(':')
         planet = parse(line[:loc], 'planet')
         host = parse(line[:loc], 'host')
-        host_aliases = [
-            parse(name, 'host')
-            for name in line[loc+1:].strip().split(',')
-        ]
-        host_aliases += [host]
-        planet_aliases = {
-            parse(name, 'planet'): planet
-            for name in line[loc+1:].strip().split(',')
-        }
+        names = line[loc+1:].strip().split(',')
+        host_aliases = [parse(name, 'host') for name in names]
+        host_aliases.append(host)
+        # (planet-style parsing leaves names unchanged)
+        planet_aliases = {name: planet for name in names}
         planet_aliases[planet] = planet
         if host != current_host:
             # Save old one
@@ -529,7 +662,8 @@ def load_aliases(style='planet', aliases_file=None):
             system['host_aliases'] += host_aliases
             system['planets'] += [planet]
             system['planet_aliases'].update(planet_aliases)
-    system['host_aliases'] = np.unique(system['host_aliases'])
-    aliases[current_host] = system
+    if current_host != '':
+        system['host_aliases'] = np.unique(system['host_aliases'])
+        aliases[current_host] = system
     return aliases
 
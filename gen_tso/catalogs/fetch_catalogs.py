@@ -10,14 +10,18 @@ __all__ = [
 ]
 
 
+import collections
 import concurrent.futures
-import multiprocessing as mp
+import copy
 from datetime import datetime, timezone
+import html
+import io
 import os
 import pickle
 import re
 import socket
 import ssl
+import time
 import urllib
 import warnings
 
@@ -30,16 +34,61 @@ from astroquery.vizier import Vizier
 from astropy.table import Table
 from astropy.units import arcsec, deg
 from bs4 import BeautifulSoup
+import pandas as pd
 import pyratbay.constants as pc
 import requests
 
-from ..utils import ROOT
-from .catalogs import load_targets, load_trexolists, load_aliases
+from ..utils import ROOT, _write_atomic
+from ..version import __version__
+from .catalogs import (
+    load_targets, load_trexolists, load_aliases, _load_trexolists_names,
+)
 from . import utils as u
 from . import target as tar
 from .target import Target
 
 
+def _new_http_session():
+    """
+    Create a requests Session keeping a pool of keep-alive connections
+    to be reused by all HTTP requests.  The session does not retry
+    failed requests by itself, callers (e.g., fetch_nea_aliases)
+    handle their own retries.
+    """
+    session = requests.Session()
+    session.headers['User-Agent'] = f'gen_tso/{__version__}'
+    adapter = requests.adapters.HTTPAdapter(
+        pool_connections=8,
+        pool_maxsize=32,
+        max_retries=0,
+    )
+    session.mount('https://', adapter)
+    return session
+
+
+# HTTP session shared by all requests (and threads), created at import
+_SESSION = _new_http_session()
+
+
+def _http_session():
+    """
+    Get the requests Session of this module.
+    """
+    return _SESSION
+
+
+def _read_nea_entries(response):
+    """
+    Parse a NEA TAP response in CSV format into a list of entries,
+    each a dictionary of column values (empty fields are set to NaN).
+    """
+    table = pd.read_csv(
+        io.BytesIO(response.content),
+        keep_default_na=False, na_values=[''],
+    )
+    return table.to_dict('records')
+
+
 def format_nea_entry(entry):
     """
     Have TOI entries the same keys as PS entries.
@@ -90,10 +139,12 @@ def get_children(host_aliases, planet_aliases):
         planet_aka[planet] = aka
 
     # cross_check with host aliases
-    children = []
-    for planet, aliases in planet_aka.items():
-        if np.any(np.isin(aliases, host_aliases)):
-            children.append(planet)
+    host_aliases = set(host_aliases)
+    children = {
+        planet
+        for planet, aliases in planet_aka.items()
+        if not host_aliases.isdisjoint(aliases)
+    }
 
     aliases = {
         alias:planet
@@ -108,46 +159,38 @@ def save_catalog(targets, catalog_file):
     Write data from a catalog of targets to a plain-text file.
     Targets will be sorted by host name and then by planet name.
     """
+    hosts = [target.host for target in targets]
+    planets = [target.planet for target in targets]
+    isort = np.lexsort((planets, hosts))
+
+    # Format all entries, then write them at once:
+    lines = [
+        '# > host: RA(deg) dec(deg) Ks_mag '
+        'rstar(rsun) mstar(msun) teff(K) log_g metallicity(dex)\n'
+        '# planet: T14(h) rplanet(rearth) mplanet(mearth) '
+        'semi-major_axis(AU) period(d) t_eq(K) is_min_mass\n'
+    ]
+    host = ''
+    for idx in isort:
+        target = targets[idx]
+        if target.host != host:
+            host = target.host
+            lines.append(
+                f">{host}: {target.ra:.7f} {target.dec:.7f} "
+                f"{target.ks_mag:.3f} {target.rstar:.3f} {target.mstar:.3f} "
+                f"{target.teff:.1f} {target.logg_star:.2f} "
+                f"{target.metal_star:.2f}\n"
+            )
+        lines.append(
+            f" {target.planet}: {target.transit_dur:.3f} "
+            f"{target.rplanet:.3f} {target.mplanet:.3f} {target.sma:.4f} "
+            f"{target.period:.5f} {target.eq_temp:.1f} "
+            f"{int(target.is_min_mass)}\n"
+        )
+
     # Save as plain text:
     with open(catalog_file, 'w') as f:
-        f.write(
-            '# > host: RA(deg) dec(deg) Ks_mag '
-            'rstar(rsun) mstar(msun) teff(K) log_g metallicity(dex)\n'
-            '# planet: T14(h) rplanet(rearth) mplanet(mearth) '
-            'semi-major_axis(AU) period(d) t_eq(K) is_min_mass\n'
-        )
-        hosts = [target.host for target in targets]
-        planets = [target.planet for target in targets]
-        isort = np.lexsort((planets, hosts))
-        host = ''
-        for idx in isort:
-            target = targets[idx]
-            planet = target.planet
-            ra = f'{target.ra:.7f}'
-            dec = f'{target.dec:.7f}'
-            ks_mag = f'{target.ks_mag:.3f}'
-            teff = f'{target.teff:.1f}'
-            rstar = f'{target.rstar:.3f}'
-            mstar = f'{target.mstar:.3f}'
-            logg = f'{target.logg_star:.2f}'
-            metal = f'{target.metal_star:.2f}'
-            rplanet = f'{target.rplanet:.3f}'
-            mplanet = f'{target.mplanet:.3f}'
-            transit_dur = f'{target.transit_dur:.3f}'
-            sma = f'{target.sma:.4f}'
-            period = f'{target.period:.5f}'
-            teq = f'{target.eq_temp:.1f}'
-            is_min_mass = int(target.is_min_mass)
-            if target.host != host:
-                host = target.host
-                f.write(
-                    f">{host}: {ra} {dec} {ks_mag} "
-                    f"{rstar} {mstar} {teff} {logg} {metal}\n",
-                )
-            f.write(
-                f" {planet}: {transit_dur} {rplanet} {mplanet} "
-                f"{sma} {period} {teq} {is_min_mass}\n",
-            )
+        f.write(''.join(lines))
 
 
 def update_exoplanet_archive(from_scratch=False):
@@ -207,23 +250,29 @@ def curate_aliases():
         tess_aliases = pickle.load(handle)
     aliases.update(tess_aliases)
 
-    jwst_names = list(load_trexolists()['target'])
+    jwst_names = _load_trexolists_names()
     # Ensure to match against NEA host names for jwst targets
+    jwst_set = set(jwst_names)
     for host,system in aliases.items():
-        is_in = np.isin(system['host_aliases'], jwst_names)
-        if np.any(is_in) and system['host'] not in jwst_names:
+        is_in = not jwst_set.isdisjoint(system['host_aliases'])
+        if is_in and system['host'] not in jwst_set:
             jwst_names.append(system['host'])
+            jwst_set.add(system['host'])
 
     prefixes = jwst_names
     prefixes += ['WASP', 'KELT', 'HAT', 'MASCARA', 'TOI', 'XO', 'TrES']
+    # Match all prefixes at once:
+    prefix_re = re.compile(
+        '|'.join(re.escape(prefix) for prefix in dict.fromkeys(prefixes))
+    )
     keep_aliases = {}
     for host,system in aliases.items():
         for alias,planet in system['planet_aliases'].items():
-            alias_host = u.get_host(alias)
-            for prefix in prefixes:
-                if alias.startswith(prefix) and alias != planet:
-                    keep_aliases[alias] = planet
-            if alias not in keep_aliases and alias_host == host and alias != planet:
+            if alias == planet:
+                continue
+            if prefix_re.match(alias):
+                keep_aliases[alias] = planet
+            elif alias not in keep_aliases and u.get_host(alias) == host:
                 keep_aliases[alias] = planet
 
     aka = u.invert_aliases(keep_aliases)
@@ -231,17 +280,18 @@ def curate_aliases():
     for name, aliases in aka.items():
         # Keep lettered aliases
         # Keep candidate aliases if lettered alias does not exist
-        lettered = [
+        is_letter = [u.is_letter(alias) for alias in aliases]
+        lettered = {
             u.get_host(alias)
-            for alias in aliases
-            if u.is_letter(alias)
-        ]
+            for alias,letter in zip(aliases, is_letter)
+            if letter
+        }
         if u.is_letter(name):
-            lettered.append(u.get_host(name))
+            lettered.add(u.get_host(name))
         aliases = [
             alias
-            for alias in aliases
-            if u.is_letter(alias) or (u.get_host(alias) not in lettered)
+            for alias,letter in zip(aliases, is_letter)
+            if letter or (u.get_host(alias) not in lettered)
         ]
         aka[name] = aliases
 
@@ -268,7 +318,7 @@ def fetch_trexolist():
     """
     url = 'https://www.stsci.edu/~nnikolov/TrExoLiSTS/JWST/trexolists.csv'
     query_parameters = {}
-    response = requests.get(url, params=query_parameters)
+    response = _http_session().get(url, params=query_parameters)
 
     if not response.ok:
         raise ValueError('Could not download TrExoLiSTS database')
@@ -303,41 +353,46 @@ def fetch_nasa_confirmed_targets():
     >>> new_targets = cat.fetch_nasa_confirmed_targets()
     """
     # Fetch all planetary system entries
-    r = requests.get(
+    r = _http_session().get(
         "https://exoplanetarchive.ipac.caltech.edu/TAP/sync?query="
         "select+hostname,pl_name,default_flag,rowupdate,sy_kmag,sy_pnum,"
         "ra,dec,st_teff,st_logg,st_met,st_rad,st_mass,st_age,pl_trandur,"
         "pl_orbper,pl_orbsmax,pl_rade,pl_masse,pl_msinie,pl_ratdor,pl_ratror+"
         "from+ps+"
-        "&format=json"
+        "&format=csv"
     )
     if not r.ok:
         raise ValueError("Something's not OK")
-    resp = [format_nea_entry(entry) for entry in r.json()]
-
-    hosts = np.unique([entry['hostname'] for entry in resp])
-    default_flags = np.array([entry['default_flag'] for entry in resp])
-    planet_entries = np.array([entry['pl_name'] for entry in resp])
-    planet_names, idx, counts = np.unique(
-        planet_entries,
-        return_index=True,
-        return_counts=True,
-    )
+    resp = [format_nea_entry(entry) for entry in _read_nea_entries(r)]
+
+    # Planets of each host, and entries of each planet
+    # (in a single pass over the entries)
+    systems = {}
+    planet_entries = {}
+    for i,entry in enumerate(resp):
+        systems.setdefault(entry['hostname'], set()).add(entry['pl_name'])
+        planet_entries.setdefault(entry['pl_name'], []).append(i)
 
     targets = []
     # Make list of unique entries
     # Group by host such that planets share same host-star values
-    for host in hosts:
-        children, counts = np.unique(
-            [entry['pl_name'] for entry in resp if entry['hostname']==host],
-            return_counts=True,
-        )
+    for host in sorted(systems):
+        children = sorted(systems[host])
         planets = []
         n_dups = []
+        # Targets for all entries of each planet, and index of default entry
+        planet_targets = {}
+        default_index = {}
         for name in children:
-            idx_entry = np.where(planet_entries==name)[0]
+            idx_entry = planet_entries[name]
             entries = [Target(resp[i]) for i in idx_entry]
-            j = np.where(default_flags[idx_entry])[0][0]
+            j = next(
+                j for j,i in enumerate(idx_entry) if resp[i]['default_flag']
+            )
+            planet_targets[name] = entries
+            default_index[name] = j
+            # Rank on copies, the original entries are re-used below
+            entries = [copy.copy(entry) for entry in entries]
             target = entries.pop(j)
             tar.rank_planets(target, entries)
             planets.append(target)
@@ -347,13 +402,12 @@ def fetch_nasa_confirmed_targets():
 
         # Now, re-do each planet, but using the single host properties
         for name in children:
-            idx_entry = np.where(planet_entries==name)[0]
-            entries = [Target(resp[i]) for i in idx_entry]
+            idx_entry = planet_entries[name]
+            entries = planet_targets[name]
             # Update with star props
-            for i in range(len(entries)):
-                entries[i].copy_star(star)
-            j = np.where(default_flags[idx_entry])[0][0]
-            target = entries.pop(j)
+            for entry in entries:
+                entry.copy_star(star)
+            target = entries.pop(default_index[name])
             tar.rank_planets(target, entries)
             target._update_dates = [resp[i]['rowupdate'] for i in idx_entry]
             targets.append(target)
@@ -417,38 +471,36 @@ def fetch_nasa_tess_candidates():
     >>> fetch_cat.fetch_tess_aliases(new_targets)
     >>> fetch_cat.crosscheck_tess_candidates()
     """
-    r = requests.get(
+    r = _http_session().get(
         "https://exoplanetarchive.ipac.caltech.edu/TAP/sync?query="
         "select+toi,toipfx,pl_trandurh,pl_trandep,pl_rade,pl_eqt,ra,dec,"
         "st_tmag,st_teff,st_logg,st_rad,pl_orbper,tfopwg_disp,rowupdate+"
         "from+toi+"
-        "&format=json"
+        "&format=csv"
     )
     if not r.ok:
         raise ValueError("Something's not OK")
 
-    entries = [format_nea_entry(entry) for entry in r.json()]
+    entries = [format_nea_entry(entry) for entry in _read_nea_entries(r)]
     ntess = len(entries)
     status = [entry['tfopwg_disp'] for entry in entries]
     dates = [entry['rowupdate'][0:10] for entry in entries]
 
     # Discard confirmed planets:
     targets = load_targets('nea_data.txt')
-    confirmed_targets = [target.planet for target in targets]
+    confirmed_targets = {target.planet for target in targets}
     confirmed_hosts = [target.host for target in targets]
+    # Index of first target of each confirmed host
+    host_index = {}
+    for i,host in enumerate(confirmed_hosts):
+        host_index.setdefault(host, i)
 
     # Use multiplicity to vet known targets:
     hosts = [entry['toipfx'] for entry in entries]
-    u_hosts, counts = np.unique(hosts, return_counts=True)
-    u_hosts = list(u_hosts)
-    multiplicity = [
-        counts[u_hosts.index(entry['toipfx'])] for entry in entries
-    ]
-    u_hosts, counts = np.unique(confirmed_hosts, return_counts=True)
-    u_hosts = list(u_hosts)
-    known_multiplicity = [
-        counts[u_hosts.index(target.host)] for target in targets
-    ]
+    host_counts = collections.Counter(hosts)
+    multiplicity = [host_counts[host] for host in hosts]
+    host_counts = collections.Counter(confirmed_hosts)
+    known_multiplicity = [host_counts[host] for host in confirmed_hosts]
 
     # Get aliases of confirmed planets:
     planet_aliases = {}
@@ -458,7 +510,7 @@ def fetch_nasa_tess_candidates():
     if os.path.exists(aliases_file):
         known_aliases = load_aliases('system')
         for host, system in known_aliases.items():
-            if host in confirmed_hosts:
+            if host in host_index:
                 planet_aliases.update(system['planet_aliases'])
                 for alias in system['host_aliases']:
                     host_aliases[alias] = host
@@ -486,8 +538,8 @@ def fetch_nasa_tess_candidates():
         if target.planet in confirmed_targets:
             j += 1
             continue
-        if target.host in confirmed_hosts:
-            idx = confirmed_hosts.index(target.host)
+        if target.host in host_index:
+            idx = host_index[target.host]
             if multiplicity[i] == known_multiplicity[idx]:
                 continue
             # Update with star props
@@ -508,12 +560,24 @@ def fetch_nasa_tess_candidates():
     new_targets = [
         target.planet
         for target,last in zip(tess_targets,last_updated)
-        if last > last_nasa or target.host in confirmed_hosts
+        if last > last_nasa or target.host in host_index
     ]
     return new_targets
 
 
-def fetch_nea_aliases(targets):
+def _save_alias_lookups(lookups, cache_file):
+    """
+    Write the NEA alias-lookup cache.
+    """
+    _write_atomic(
+        cache_file,
+        lambda handle: pickle.dump(
+            lookups, handle, protocol=pickle.HIGHEST_PROTOCOL,
+        ),
+    )
+
+
+def fetch_nea_aliases(targets, max_age=None):
     """
     Fetch target aliases as known by https://exoplanetarchive.ipac.caltech.edu/
 
@@ -525,6 +589,11 @@ def fetch_nea_aliases(targets):
     ----------
     targets: String or 1D iterable of strings
         Target(s) to fetch from the NEA database.
+    max_age: Float
+        If not None, reuse the NEA responses cached on disk that are
+        less than max_age days old, query only the remaining targets,
+        and add their responses to the cache.  The cache is updated
+        as responses arrive, so an interrupted run can be resumed.
 
     Returns
     -------
@@ -543,6 +612,10 @@ def fetch_nea_aliases(targets):
     """
     if isinstance(targets, str):
         targets = [targets]
+    # The lookup service has no batch mode, at least query each
+    # distinct name only once:
+    all_targets = list(targets)
+    targets = list(dict.fromkeys(all_targets))
     ntargets = len(targets)
 
     urls = np.array([
@@ -551,38 +624,67 @@ def fetch_nea_aliases(targets):
         for target in targets
     ])
 
+    # Share the pooled keep-alive connections across all threads and
+    # attempts (skips a TCP/TLS handshake per request)
+    nthreads = min(32, (os.cpu_count() or 1) + 4)
+    session = _http_session()
+
     def fetch_url(url):
         try:
-            response = requests.get(url)
+            response = session.get(url, timeout=60)
             return response
         except:
             return None
 
     fetch_status = np.tile(2, ntargets)
     responses = np.tile({}, ntargets)
-    n_attempts = 0
-    while np.any(fetch_status>0) and n_attempts < 10:
-        n_attempts += 1
-        mask = fetch_status > 0
-        with concurrent.futures.ThreadPoolExecutor() as executor:
-            results = list(executor.map(fetch_url, urls[mask]))
-
-        j = 0
-        for i in range(ntargets):
-            if fetch_status[i] <= 0:
-                continue
-            r = results[j]
-            j += 1
-            if r is None:
-                continue
-            if not r.ok:
-                warnings.warn(f"Alias fetching failed for '{targets[i]}'")
-                fetch_status[i] -= 1
+
+    # Reuse recent responses:
+    cache_file = f'{ROOT}data/nea_alias_lookups.pickle'
+    lookups = {}
+    if max_age is not None and os.path.exists(cache_file):
+        with open(cache_file, 'rb') as handle:
+            lookups = pickle.load(handle)
+        now = time.time()
+        for i,target in enumerate(targets):
+            if target not in lookups:
                 continue
-            responses[i] = r.json()
-            fetch_status[i] = 0
-        fetched = np.sum(fetch_status <= 0)
-        print(f'Fetched {fetched}/{ntargets} entries on try {n_attempts}')
+            lookup_time, resp = lookups[target]
+            if now - lookup_time < max_age*86400.0:
+                responses[i] = resp
+                fetch_status[i] = 0
+
+    n_attempts = 0
+    executor = concurrent.futures.ThreadPoolExecutor(nthreads)
+    with executor:
+        while np.any(fetch_status>0) and n_attempts < 10:
+            n_attempts += 1
+            futures = {
+                executor.submit(fetch_url, urls[i]): i
+                for i in np.flatnonzero(fetch_status > 0)
+            }
+            done = concurrent.futures.as_completed(futures)
+            for k,future in enumerate(done):
+                i = futures[future]
+                r = future.result()
+                if r is None:
+                    continue
+                if not r.ok:
+                    warnings.warn(f"Alias fetching failed for '{targets[i]}'")
+                    fetch_status[i] -= 1
+                    continue
+                responses[i] = r.json()
+                fetch_status[i] = 0
+                if max_age is not None:
+                    lookups[targets[i]] = time.time(), responses[i]
+                    # Checkpoint, an interrupted run can be resumed
+                    if k % 100 == 99:
+                        _save_alias_lookups(lookups, cache_file)
+            fetched = np.sum(fetch_status <= 0)
+            print(f'Fetched {fetched}/{ntargets} entries on try {n_attempts}')
+
+    if max_age is not None:
+        _save_alias_lookups(lookups, cache_file)
 
     host_aliases_list = []
     planet_aliases_list = []
@@ -614,9 +716,72 @@ def fetch_nea_aliases(targets):
                 planet_aliases[alias] = planet
         planet_aliases_list.append(planet_aliases)
 
+    if len(all_targets) > ntargets:
+        index = {target:i for i,target in enumerate(targets)}
+        host_aliases_list = [
+            dict(host_aliases_list[index[target]]) for target in all_targets
+        ]
+        planet_aliases_list = [
+            dict(planet_aliases_list[index[target]]) for target in all_targets
+        ]
     return host_aliases_list, planet_aliases_list
 
 
+def _set_simbad_fields():
+    """
+    Set the Simbad output fields for the alias queries:
+    object type, identifiers, and Ks magnitude.
+    """
+    simbad.reset_votable_fields()
+    if hasattr(simbad, 'remove_votable_fields'):
+        # astroquery < 0.4.8
+        simbad.remove_votable_fields('coordinates')
+        simbad.add_votable_fields("otype", "ids", "flux(K)")
+    else:
+        simbad.add_votable_fields("otype", "ids", "K")
+    #simbad.add_votable_fields("fe_h")
+
+
+def _query_simbad_objects(names):
+    """
+    Query a list of names in Simbad with a single request.
+    Return a dictionary with the 'OTYPE', 'IDS', and 'FLUX_K' values
+    of each found name.
+    """
+    rows = {}
+    if len(names) == 0:
+        return rows
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        simbad_info = simbad.query_objects(names)
+    if simbad_info is None:
+        return rows
+
+    if 'user_specified_id' in simbad_info.colnames:
+        # astroquery >= 0.4.8, one row per name (no main_id if not found)
+        found = [
+            (str(row['user_specified_id']), row)
+            for row in simbad_info
+            if not np.ma.is_masked(row['main_id']) and row['main_id'] != ''
+        ]
+        columns = 'otype', 'ids', 'K'
+    else:
+        found = [
+            (names[row['SCRIPT_NUMBER_ID']-1], row)
+            for row in simbad_info
+        ]
+        columns = 'OTYPE', 'IDS', 'FLUX_K'
+
+    otype, ids, kmag = columns
+    for name, row in found:
+        rows[name] = {
+            'OTYPE': row[otype],
+            'IDS': row[ids],
+            'FLUX_K': row[kmag],
+        }
+    return rows
+
+
 def fetch_simbad_aliases(target, verbose=True):
     """
     Fetch target aliases and Ks magnitude as known by Simbad.
@@ -626,46 +791,85 @@ def fetch_simbad_aliases(target, verbose=True):
     >>> from gen_tso.catalogs.update_catalogs import fetch_simbad_aliases
     >>> aliases, ks_mag = fetch_simbad_aliases('WASP-69b')
     """
-    simbad.reset_votable_fields()
-    simbad.remove_votable_fields('coordinates')
-    simbad.add_votable_fields("otype", "otypes", "ids")
-    simbad.add_votable_fields("flux(K)")
-    #simbad.add_votable_fields("fe_h")
+    aliases, kmags = fetch_simbad_aliases_batch([target], verbose)
+    return aliases[0], kmags[0]
 
-    host_alias = []
-    kmag = np.nan
-    with warnings.catch_warnings():
-        warnings.simplefilter("ignore")
-        simbad_info = simbad.query_object(target)
-    if simbad_info is None:
-        if verbose:
-            print(f'no Simbad entry for target {repr(target)}')
-        return host_alias, kmag
 
-    object_type = simbad_info['OTYPE'].value.data[0]
-    if 'Planet' in object_type:
+def fetch_simbad_aliases_batch(targets, verbose=True):
+    """
+    Fetch aliases and Ks magnitudes as known by Simbad for a list
+    of targets (querying all targets in one request).
+
+    Returns
+    -------
+    host_aliases: 1D list of lists
+        Host aliases for each target (empty list if not found).
+    kmags: 1D list of floats
+        Ks magnitude for each target (np.nan if not found).
+
+    Examples
+    --------
+    >>> from gen_tso.catalogs.fetch_catalogs import fetch_simbad_aliases_batch
+    >>> aliases, ks_mags = fetch_simbad_aliases_batch(['WASP-69b', 'HD 189733'])
+    """
+    _set_simbad_fields()
+    targets = list(targets)
+    simbad_info = _query_simbad_objects(list(dict.fromkeys(targets)))
+
+    # Planet entries, go after their star:
+    planet_hosts = {}
+    for target, info in simbad_info.items():
+        # 'Planet' in astroquery < 0.4.8, otherwise the 'Pl' code
+        otype = str(info['OTYPE'])
+        if 'Planet' not in otype and not otype.startswith('Pl'):
+            continue
         if target[-1].isalpha():
-            host = target[:-1]
+            planet_hosts[target] = target[:-1]
         elif '.' in target:
             end = target.rindex('.')
-            host = target[:end]
+            planet_hosts[target] = target[:end]
         else:
-            #target_id = simbad_info['MAIN_ID'].value.data[0]
-            return host_alias, kmag
-        # go after star
-        simbad_info = simbad.query_object(host)
-        if simbad_info is None:
+            planet_hosts[target] = None
+    hosts = [host for host in planet_hosts.values() if host is not None]
+    host_info = _query_simbad_objects(list(dict.fromkeys(hosts)))
+
+    host_aliases = []
+    kmags = []
+    for target in targets:
+        info = simbad_info.get(target)
+        if info is None:
             if verbose:
+                print(f'no Simbad entry for target {repr(target)}')
+        elif target in planet_hosts:
+            host = planet_hosts[target]
+            info = host_info.get(host)
+            if host is not None and info is None and verbose:
                 print(f'Simbad host {repr(host)} not found')
-            return host_alias, kmag
 
-    host_info = simbad_info['IDS'].value.data[0]
-    host_alias = host_info.split('|')
-    kmag = simbad_info['FLUX_K'].value.data[0]
-    # fetch metallicity?
-    if not np.isfinite(kmag):
-        kmag = np.nan
-    return host_alias, kmag
+        if info is None:
+            host_aliases.append([])
+            kmags.append(np.nan)
+            continue
+        host_aliases.append(str(info['IDS']).split('|'))
+        kmag = float(np.ma.filled(info['FLUX_K'], np.nan))
+        # fetch metallicity?
+        if not np.isfinite(kmag):
+            kmag = np.nan
+        kmags.append(kmag)
+    return host_aliases, kmags
+
+
+# 2MASS catalog queries
+_TWO_MASS = 'II/246/out'
+_VIZIER_2MASS = Vizier(
+    catalog=_TWO_MASS,
+    columns=['RAJ2000', 'DEJ2000', '2MASS', 'Kmag'],
+    keywords=['Stars'],
+)
+_VIZIER_2MASS_REGION = Vizier(
+    catalog=_TWO_MASS,
+    columns=['RAJ2000', 'DEJ2000', '2MASS', 'Kmag'],
+)
 
 
 def fetch_vizier_ks(target, verbose=True):
@@ -685,21 +889,13 @@ def fetch_vizier_ks(target, verbose=True):
     >>> fetch_vizier_ks('2MASS J08024565+2139348')
     >>> fetch_vizier_ks('Gaia DR2 671023360793596672')
     """
-    # 2mass catalog
-    catalog = 'II/246/out'
-    vizier = Vizier(
-        catalog=catalog,
-        columns=['RAJ2000', 'DEJ2000', '2MASS', 'Kmag'],
-        keywords=['Stars'],
-    )
-
-    result = vizier.query_object(target, radius=0.5*arcsec)
+    result = _VIZIER_2MASS.query_object(target, radius=0.5*arcsec)
     n_entries = np.size(result)
     if n_entries == 0:
         print(f"Target not found: '{target}'")
         return np.nan
 
-    data = result[catalog].as_array().data
+    data = result[_TWO_MASS].as_array().data
     if n_entries == 1:
         return data[0][3]
     elif n_entries > 1 and target.startswith('2MASS'):
@@ -713,7 +909,39 @@ def fetch_vizier_ks(target, verbose=True):
     return np.nan
 
 
-def fetch_aliases(hosts, output_file=None, known_aliases=None):
+def fetch_vizier_ks_batch(ra, dec, radius=5.0):
+    """
+    Query the 2MASS catalog via Vizier for a list of coordinates,
+    all in a single request.
+
+    Parameters
+    ----------
+    ra: 1D float iterable
+        Right ascension of the targets (deg).
+    dec: 1D float iterable
+        Declination of the targets (deg).
+    radius: Float
+        Search radius around each coordinate (arcsec).
+
+    Returns
+    -------
+    ks_mags: Dictionary
+        Ks magnitudes of the found sources, with the '2MASS J...'
+        names as keys.
+    """
+    targets = Table(
+        [np.array(ra)*deg, np.array(dec)*deg],
+        names=('_RAJ2000', '_DEJ2000'),
+    )
+    results = _VIZIER_2MASS_REGION.query_region(targets, radius=radius*arcsec)
+    data = results[_TWO_MASS].as_array().data
+    ks_mags = {}
+    for d in data:
+        ks_mags.setdefault(f'2MASS J{d[3]}', d[4])
+    return ks_mags
+
+
+def fetch_aliases(hosts, output_file=None, known_aliases=None, max_age=None):
     """
     Fetch aliases from the NEA and Simbad databases for a list
     of host stars.  Store output dictionary of aliases to pickle file.
@@ -727,6 +955,9 @@ def fetch_aliases(hosts, output_file=None, known_aliases=None):
     known_aliases: Dictionary
         Dictionary of known aliases, the new aliases will be added
         on top o this dictionary.
+    max_age: Float
+        If not None, reuse NEA alias lookups cached within the last
+        max_age days (see fetch_nea_aliases()).
 
     Returns
     -------
@@ -754,7 +985,7 @@ def fetch_aliases(hosts, output_file=None, known_aliases=None):
     if known_aliases is None:
         known_aliases = {}
 
-    host_aliases, planet_aliases = fetch_nea_aliases(hosts)
+    host_aliases, planet_aliases = fetch_nea_aliases(hosts, max_age)
 
     # Keep track of trexolists aliases to cross-check:
     trexo_data = load_trexolists(grouped=True)
@@ -762,25 +993,35 @@ def fetch_aliases(hosts, output_file=None, known_aliases=None):
         list(np.unique(jwst_target['target']))
         for jwst_target in trexo_data
     ]
-    jwst_names = np.unique(np.concatenate(jwst_aliases))
-
-    aliases = {}
+    jwst_names = set(np.concatenate(jwst_aliases))
+    # trexolists groups where each name appears:
+    jwst_groups = {}
+    for j_aliases in jwst_aliases:
+        for alias in j_aliases:
+            jwst_groups.setdefault(alias, []).append(j_aliases)
+
+    # NEA names of the host stars:
     nhosts = len(hosts)
+    host_names = []
+    stars_aka = []
     for i in range(nhosts):
-        # Isolate host-planet(s) aliases
-        stars = np.unique(list(host_aliases[i].values()))
         hosts_aka = u.invert_aliases(host_aliases[i])
         for host, h_aliases in hosts_aka.items():
             if hosts[i] in h_aliases:
                 host_name = host
                 break
+        host_names.append(host_name)
+        stars_aka.append(hosts_aka)
 
-        h_aliases = [
-            alias
-            for alias,host in host_aliases[i].items()
-            if host == host_name
-        ]
-        if len(stars) == 1:
+    # Complement with Simbad aliases (one batch query for all hosts):
+    simbad_aliases, _ = fetch_simbad_aliases_batch(host_names, verbose=False)
+
+    aliases = {}
+    for i in range(nhosts):
+        # Isolate host-planet(s) aliases
+        host_name = host_names[i]
+        h_aliases = list(stars_aka[i].get(host_name, []))
+        if len(stars_aka[i]) == 1:
             p_aliases = planet_aliases[i].copy()
         else:
             p_aliases = get_children(h_aliases, planet_aliases[i])
@@ -790,57 +1031,54 @@ def fetch_aliases(hosts, output_file=None, known_aliases=None):
             if u.is_letter(key) or u.is_candidate(key)
         }
         children_names = np.unique(list(p_aliases.values()))
-
-        in_jwst = np.isin(h_aliases, jwst_names)
-        if np.any(in_jwst):
-            j_alias = np.array(h_aliases)[in_jwst]
+        seen_aliases = set(h_aliases)
 
         # Complement with Simbad aliases:
-        s_aliases, kmag = fetch_simbad_aliases(host_name, verbose=False)
         new_aliases = []
-        for alias in s_aliases:
+        for alias in simbad_aliases[i]:
             alias = re.sub(r'\s+', ' ', alias)
             is_new = (
                 alias in jwst_names or
-                alias.startswith('G ') or
-                alias.startswith('GJ ') or
-                alias.startswith('Wolf ') or
-                alias.startswith('2MASS ')
+                alias.startswith(('G ', 'GJ ', 'Wolf ', '2MASS '))
             )
-            if is_new and alias not in h_aliases:
+            if is_new and alias not in seen_aliases:
                 new_aliases.append(alias)
                 h_aliases.append(alias)
+                seen_aliases.add(alias)
 
         # Add JWST host aliases:
-        in_jwst = np.isin(h_aliases, jwst_names)
-        if np.any(in_jwst):
-            j_alias = np.array(h_aliases)[in_jwst][0]
-            for j_aliases in jwst_aliases:
-                if j_alias not in j_aliases:
-                    continue
-                h_aliases += [
+        j_alias = next(
+            (alias for alias in h_aliases if alias in jwst_names),
+            None,
+        )
+        if j_alias is not None:
+            for j_aliases in jwst_groups[j_alias]:
+                jwst_new = [
                     alias
                     for alias in j_aliases
-                    if alias not in h_aliases
+                    if alias not in seen_aliases
                 ]
+                h_aliases += jwst_new
+                seen_aliases.update(jwst_new)
 
         # Replicate host aliases as planet aliases:
         planet_aka = u.invert_aliases(p_aliases)
         for planet, pals in planet_aka.items():
+            letter = u.get_letter(planet)
+            known_planets = set(pals)
+            # Hosts of the lettered and candidate aliases:
+            letter_hosts = {u.get_host(p) for p in pals if u.is_letter(p)}
+            candidate_hosts = {
+                u.get_host(p) for p in pals if u.is_candidate(p)
+            }
+            lettered = [p for p in pals if u.is_letter(p)]
             for host in h_aliases:
-                letter = u.get_letter(planet)
                 planet_name = f'{host}{letter}'
                 # The conditions to add a target:
-                is_new = planet_name not in pals
+                is_new = planet_name not in known_planets
                 # There is a planet or a candidate in list
-                planet_exists = np.any([
-                    u.get_host(p) == host and u.is_letter(p)
-                    for p in pals
-                ])
-                candidate_exists = np.any([
-                    u.get_host(p) == host and u.is_candidate(p)
-                    for p in pals
-                ])
+                planet_exists = host in letter_hosts
+                candidate_exists = host in candidate_hosts
                 # Do not downgrade planet -> candidate
                 not_downgrade = not (
                     u.is_candidate(planet_name) and
@@ -853,10 +1091,7 @@ def fetch_aliases(hosts, output_file=None, known_aliases=None):
                     not planet_name.startswith('TOI')
                 )
                 # There is a letter version of it with same root
-                letter_exists = np.any([
-                    p.startswith(host) and u.is_letter(p)
-                    for p in pals
-                ])
+                letter_exists = any(p.startswith(host) for p in lettered)
                 # Upgrade candidate->planet only if is lettered anywhere else
                 upgrade = (
                     u.is_letter(planet_name) and
@@ -882,7 +1117,7 @@ def fetch_aliases(hosts, output_file=None, known_aliases=None):
 
     if output_file is not None:
         with open(output_file, 'wb') as handle:
-            pickle.dump(aliases, handle, protocol=4)
+            pickle.dump(aliases, handle, protocol=pickle.HIGHEST_PROTOCOL)
 
     return aliases
 
@@ -1005,6 +1240,12 @@ def crosscheck_tess_candidates(ncpu=None):
     Before calling this function, you want to run
     fetch_nasa_tess_candidates() and crosscheck_tess_candidates()
 
+    Parameters
+    ----------
+    ncpu: Integer
+        Number of parallel requests when scraping Ks magnitudes
+        from the NEA website.  If None, use the ThreadPoolExecutor default.
+
     Examples
     --------
     >>> from gen_tso.catalogs import fetch_catalogs as fetch_cat
@@ -1012,9 +1253,6 @@ def crosscheck_tess_candidates(ncpu=None):
     >>> fetch_cat.fetch_tess_aliases(new_targets)
     >>> fetch_cat.crosscheck_tess_candidates()
     """
-    if ncpu is None:
-        ncpu = mp.cpu_count()
-
     candidates = load_targets('tess_candidates_tmp.txt')
     targets = load_targets()
     confirmed_planets = [target.planet for target in targets]
@@ -1052,6 +1290,7 @@ def crosscheck_tess_candidates(ncpu=None):
     aka = u.invert_aliases(host_aliases)
 
     # Cross-check with confirmed targets:
+    confirmed_planets = set(confirmed_planets)
     candidates = [
         target for target in candidates
         if planet_aliases[target.planet] not in confirmed_planets
@@ -1062,11 +1301,13 @@ def crosscheck_tess_candidates(ncpu=None):
     # Zeroth idea, check if I already had the Ks mag:
     if os.path.exists(f'{ROOT}data/tess_data.txt'):
         known_candidates = load_targets('tess_data.txt')
-        known_hosts = [target.host for target in known_candidates]
+        # Ks mag by host (first entry of each host)
+        known_ks_mag = {}
+        for target in known_candidates:
+            known_ks_mag.setdefault(target.host, target.ks_mag)
         for target in candidates:
-            if target.host in known_hosts:
-                idx = known_hosts.index(target.host)
-                target.ks_mag = known_candidates[idx].ks_mag
+            if target.host in known_ks_mag:
+                target.ks_mag = known_ks_mag[target.host]
 
     # First idea, search in simbad using best known alias to get Ks magnitude
     catalogs = ['2MASS', 'Gaia DR3', 'Gaia DR2', 'TOI']
@@ -1094,53 +1335,64 @@ def crosscheck_tess_candidates(ncpu=None):
         if np.isnan(target.ks_mag)
         if hosts[i].startswith('2MASS')
     ]
-    ra = np.array([target.ra for target in missing_targets]) * deg
-    dec = np.array([target.dec for target in missing_targets]) * deg
-
-    catalog = 'II/246/out'
-    vizier = Vizier(
-        catalog=catalog,
-        columns=['RAJ2000', 'DEJ2000', '2MASS', 'Kmag'],
-    )
-    two_mass_targets = Table(
-        [ra, dec],
-        names=('_RAJ2000', '_DEJ2000'),
-    )
-    results = vizier.query_region(two_mass_targets, radius=5.0*arcsec)
-    data = results[catalog].as_array().data
-    vizier_names = [f'2MASS J{d[3]}' for d in data]
-    vizier_ks_mag = [d[4] for d in data]
+    ra = [target.ra for target in missing_targets]
+    dec = [target.dec for target in missing_targets]
+    vizier_ks_mag = fetch_vizier_ks_batch(ra, dec)
 
     for target in candidates:
         host = u.select_alias(aka[target.host], catalogs)
-        if host in vizier_names:
-            idx = vizier_names.index(host)
-            target.ks_mag = vizier_ks_mag[idx]
+        if host in vizier_ks_mag:
+            target.ks_mag = vizier_ks_mag[host]
 
     # Last resort, scrap from the NEA website
     missing_hosts = np.unique([
         target.host for target in candidates
         if np.isnan(target.ks_mag)
     ])
-    with mp.get_context('fork').Pool(ncpu) as pool:
-        scrap_ks = pool.map(scrap_nea_kmag, missing_hosts)
+    # (threads, the requests are I/O bound)
+    with concurrent.futures.ThreadPoolExecutor(ncpu) as executor:
+        scrap_ks = list(executor.map(scrap_nea_kmag, missing_hosts))
+    scrap_ks = dict(zip(missing_hosts, scrap_ks))
     for target in candidates:
-        if target.host in missing_hosts:
-            idx = list(missing_hosts).index(target.host)
-            target.ks_mag = scrap_ks[idx]
+        if target.host in scrap_ks:
+            target.ks_mag = scrap_ks[target.host]
 
     # Save as plain text:
     catalog_file = f'{ROOT}data/tess_data.txt'
     save_catalog(candidates, catalog_file)
 
 
+def _parse_kmag_texts(dd_texts):
+    """
+    Get the Ks magnitude from the texts of the <dd> tags of a NEA
+    overview page (np.nan if not found).
+    """
+    pm = '±'
+    kmag = np.nan
+    for text in dd_texts:
+        texts = text.split()
+        if 'mKs' in texts:
+            kmag_text = texts[-1]
+            if kmag_text == '---':
+                kmag = 0.0
+            elif pm in kmag_text:
+                kmag = float(kmag_text[0:kmag_text.find(pm)])
+            else:
+                kmag = float(kmag_text)
+    return kmag
+
+
+_DD_RE = re.compile(r'<dd\b[^>]*>(.*?)</dd>', re.S)
+_TAG_RE = re.compile(r'<[^>]*>')
+
+
 def scrap_nea_kmag(target):
     """
     >>> target = 'TOI-5290'
     >>> target = 'TOI-4345'
     >>> scrap_nea_kmag(target)
     """
-    response = requests.get(
+    response = _http_session().get(
         url=f'https://exoplanetarchive.ipac.caltech.edu/overview/{target}',
     )
     kmag = np.nan
@@ -1148,19 +1400,19 @@ def scrap_nea_kmag(target):
         print(f'ERROR {target}')
         return kmag
 
-    soup = BeautifulSoup(response.content, 'html.parser')
-    pm = '±'
-    for dd in soup.find_all('dd'):
-        texts = dd.get_text().split()
-        if 'mKs' in texts:
-            #print(target, dd.text.split())
-            kmag_text = texts[-1]
-            if kmag_text == '---':
-                kmag = 0.0
-            elif pm in kmag_text:
-                kmag = float(kmag_text[0:kmag_text.find(pm)])
-            else:
-                kmag = float(kmag_text)
+    # Only look at the <dd> tags' text (no need to parse the whole page)
+    page = response.text
+    dd_texts = [
+        html.unescape(_TAG_RE.sub('', dd))
+        for dd in _DD_RE.findall(page)
+        if 'mKs' in dd
+    ]
+    kmag = _parse_kmag_texts(dd_texts)
+    if np.isnan(kmag) and 'mKs' in page:
+        # Layout not as expected, go the long way
+        soup = BeautifulSoup(response.content, 'html.parser')
+        dd_texts = [dd.get_text() for dd in soup.find_all('dd')]
+        kmag = _parse_kmag_texts(dd_texts)
     return kmag
 
 
@@ -5,6 +5,8 @@ __all__ = [
     'Target',
 ]
 
+from math import isnan
+
 import numpy as np
 import pyratbay.constants as pc
 import pyratbay.atmosphere as pa
@@ -12,10 +14,29 @@ import pyratbay.atmosphere as pa
 from . import utils as u
 
 
+# Unit conversion factors used by the solve_*() functions:
+_AU = pc.au
+_DAY = pc.day
+_MSUN = pc.msun
+_RSUN = pc.rsun
+_REARTH = pc.rearth
+_TWO_PI_G = 2.0*np.pi / np.sqrt(pc.G)
+
+
 class Target():
     """
     A handy exoplanet target object.
     """
+    # No per-instance __dict__, the catalogs hold thousands of targets
+    __slots__ = (
+        'host', 'mstar', 'rstar', 'teff', 'logg_star', 'metal_star',
+        'ks_mag', 'ra', 'dec',
+        'planet', 'mplanet', 'rplanet', 'sma', 'period', 'ars', 'rprs',
+        'eq_temp', 'transit_dur',
+        'is_min_mass', 'is_transiting', 'is_confirmed', 'aliases',
+        'is_jwst', 'trexo_data', '_update_dates',
+    )
+
     def __init__(
         self, entry=None,
         host=None, mstar=np.nan, rstar=np.nan, teff=np.nan, logg_star=np.nan,
@@ -82,19 +103,19 @@ class Target():
     def _complete_values(self):
         # Rank groups
         ars = (
-            np.isnan(self.sma) +
-            np.isnan(self.ars) +
-            np.isnan(self.rstar)
+            isnan(self.sma) or
+            isnan(self.ars) or
+            isnan(self.rstar)
         )
         rprs = (
-            np.isnan(self.rplanet) +
-            np.isnan(self.rprs) +
-            np.isnan(self.rstar)
+            isnan(self.rplanet) or
+            isnan(self.rprs) or
+            isnan(self.rstar)
         )
         aperiod = (
-            np.isnan(self.period) +
-            np.isnan(self.sma) +
-            np.isnan(self.mstar)
+            isnan(self.period) or
+            isnan(self.sma) or
+            isnan(self.mstar)
         )
         solve_order = np.argsort([ars, rprs, aperiod])
         for i in solve_order:
@@ -309,21 +330,20 @@ def solve_sma_period(period, sma, mstar):
         Stellar mass (m_sun).
     """
     missing = (
-        np.isnan(period) +
-        np.isnan(sma) +
-        np.isnan(mstar)
+        isnan(period) +
+        isnan(sma) +
+        isnan(mstar)
     )
     # Know everything or not enough:
     if missing != 1:
         return period, sma, mstar
 
-    two_pi_G = 2.0*np.pi / np.sqrt(pc.G)
-    if np.isnan(mstar):
-        mstar = (sma*pc.au)**3.0 / (period*pc.day/two_pi_G)**2.0 / pc.msun
-    elif np.isnan(period):
-        period = np.sqrt((sma*pc.au)**3.0 / (mstar*pc.msun)) * two_pi_G / pc.day
-    elif np.isnan(sma):
-        sma = ((period*pc.day/two_pi_G)**2.0 * (mstar*pc.msun))**(1/3) / pc.au
+    if isnan(mstar):
+        mstar = (sma*_AU)**3.0 / (period*_DAY/_TWO_PI_G)**2.0 / _MSUN
+    elif isnan(period):
+        period = np.sqrt((sma*_AU)**3.0 / (mstar*_MSUN)) * _TWO_PI_G / _DAY
+    elif isnan(sma):
+        sma = ((period*_DAY/_TWO_PI_G)**2.0 * (mstar*_MSUN))**(1/3) / _AU
 
     return period, sma, mstar
 
@@ -342,20 +362,20 @@ def solve_rprs(rplanet, rstar, rprs):
         Planet--star radius ratio.
     """
     missing = (
-        np.isnan(rplanet) +
-        np.isnan(rstar) +
-        np.isnan(rprs)
+        isnan(rplanet) +
+        isnan(rstar) +
+        isnan(rprs)
     )
     # Know everything or not enough:
     if missing != 1:
         return rplanet, rstar, rprs
 
-    if np.isnan(rplanet):
-        rplanet = rprs * (rstar*pc.rsun) / pc.rearth
-    elif np.isnan(rstar):
-        rstar = rplanet*pc.rearth / rprs / pc.rsun
-    elif np.isnan(rprs):
-        rprs = rplanet*pc.rearth / (rstar*pc.rsun)
+    if isnan(rplanet):
+        rplanet = rprs * (rstar*_RSUN) / _REARTH
+    elif isnan(rstar):
+        rstar = rplanet*_REARTH / rprs / _RSUN
+    elif isnan(rprs):
+        rprs = rplanet*_REARTH / (rstar*_RSUN)
 
     return rplanet, rstar, rprs
 
@@ -374,20 +394,20 @@ def solve_a_rs(sma, rstar, ars):
         sma--rstar ratio.
     """
     missing = (
-        np.isnan(sma) +
-        np.isnan(ars) +
-        np.isnan(rstar)
+        isnan(sma) +
+        isnan(ars) +
+        isnan(rstar)
     )
     # Know everything or not enough:
     if missing != 1:
        return sma, rstar, ars
 
-    if np.isnan(sma):
-        sma = ars * rstar*pc.rsun / pc.au
-    elif np.isnan(rstar):
-        rstar = sma*pc.au / ars / pc.rsun
-    elif np.isnan(ars):
-        ars = sma*pc.au / (rstar*pc.rsun)
+    if isnan(sma):
+        sma = ars * rstar*_RSUN / _AU
+    elif isnan(rstar):
+        rstar = sma*_AU / ars / _RSUN
+    elif isnan(ars):
+        ars = sma*_AU / (rstar*_RSUN)
 
     return sma, rstar, ars
 
@@ -479,13 +499,15 @@ def rank_planets(target, alt_targets):
         'metal_star',
         'logg_star',
     ]
+    # Alternative entries do not change, get their availability once
+    alt_available = ~np.array(
+        [missing_mask(alt) for alt in alt_targets], dtype=bool,
+    )
     t = 0
     for t in range(len(alt_targets)):
         missing = missing_mask(target)
         # rank by fill as many missing values as possible
-        for i,alt in enumerate(alt_targets):
-            alt_miss = missing_mask(alt)
-            rank[i] = np.sum(~alt_miss & missing)
+        rank[:] = np.sum(alt_available & missing, axis=1)
         if np.all(rank==0):
             break
 
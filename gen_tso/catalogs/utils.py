@@ -19,9 +19,29 @@ __all__ = [
     'as_str',
 ]
 
+from functools import lru_cache
 import re
+import string
 
-import numpy as np
+
+_WS_RE = re.compile(r'\s+')
+_LOWER = frozenset(string.ascii_lowercase)
+
+# Case and prefix fixes applied to trexolists names (order matters):
+_NAME_REPLACEMENTS = (
+    ('KEPLER', 'Kepler'),
+    ('TRES', 'TrES'),
+    ('WOLF-', 'Wolf '),
+    ('HATP', 'HAT-P-'),
+    ('AU-MIC', 'AU Mic'),
+    ('GL', 'GJ'),
+)
+_NAME_PREFIXES = (
+    'L', 'G', 'HD', 'GJ', 'LTT', 'LHS', 'HIP', 'WD', 'LP', '2MASS', 'PSR',
+)
+_DASHED_PREFIXES = ('CD-', 'BD-', 'BD+')
+# Program-specific suffixes in trexolists names:
+_NAME_SUFFIXES = ('-offset', '-updated', '-copy', '-revised')
 
 
 def esasky_js_circle(ra, dec, radius, color='#15B01A'):
@@ -167,32 +187,26 @@ def esasky_js_catalog(query):
     return command
 
 
+@lru_cache(maxsize=4096)
 def normalize_name(target):
     """
     Normalize target names into a 'more standard' format.
     Mainly to resolve trexolists target names.
+    Results are memoized since trexolists repeat names across visits.
     """
-    name = re.sub(r'\s+', ' ', target)
+    name = _WS_RE.sub(' ', target)
     # It's a case issue:
-    name = name.replace('KEPLER', 'Kepler')
-    name = name.replace('TRES', 'TrES')
-    name = name.replace('WOLF-', 'Wolf ')
-    name = name.replace('HATP', 'HAT-P-')
-    name = name.replace('AU-MIC', 'AU Mic')
+    for old, new in _NAME_REPLACEMENTS:
+        name = name.replace(old, new)
     # Prefixes
-    name = name.replace('GL', 'GJ')
-    prefixes = [
-        'L', 'G', 'HD', 'GJ', 'LTT', 'LHS', 'HIP', 'WD', 'LP', '2MASS', 'PSR',
-    ]
-    for prefix in prefixes:
+    for prefix in _NAME_PREFIXES:
         prefix_len = len(prefix)
         if name.startswith(prefix) and not name[prefix_len].isalpha():
             name = name.replace(f'{prefix}-', f'{prefix} ')
             if name[prefix_len] != ' ':
                 name = f'{prefix} ' + name[prefix_len:]
 
-    prefixes = ['CD-', 'BD-', 'BD+']
-    for prefix in prefixes:
+    for prefix in _DASHED_PREFIXES:
         prefix_len = len(prefix)
         dash_loc = name.find('-', prefix_len)
         if name.startswith(prefix) and dash_loc > 0:
@@ -203,10 +217,8 @@ def normalize_name(target):
     # Custom corrections:
     if name in ['55CNC', 'RHO01-CNC']:
         name = '55 Cnc'
-    name = name.replace('-offset', '')
-    name = name.replace('-updated', '')
-    name = name.replace('-copy', '')
-    name = name.replace('-revised', '')
+    for suffix in _NAME_SUFFIXES:
+        name = name.replace(suffix, '')
     if name.endswith('-'):
         name = name[:-1]
     if name == 'WD 1856':
@@ -220,14 +232,14 @@ def is_letter(name):
     """
     Check if name ends with a blank + lower-case letter (it's a planet)
     """
-    return name[-1].islower() and name[-2] == ' '
+    return len(name) >= 2 and name[-1] in _LOWER and name[-2] == ' '
 
 
 def is_candidate(name):
     """
-    Check if name ends with a blank + lower-case letter (it's a planet)
+    Check if name ends with a dot + two numbers (it's a candidate)
     """
-    return len(name)>=3 and name[-3] == '.' and name[-2:].isnumeric()
+    return len(name) >= 3 and name[-3] == '.' and name[-2:].isnumeric()
 
 
 def get_letter(name):
@@ -244,8 +256,8 @@ def get_letter(name):
     """
     if is_letter(name):
         return name[-2:]
-    if '.' in name:
-        idx = name.rfind('.')
+    idx = name.rfind('.')
+    if idx >= 0:
         return name[idx:]
     return ''
 
@@ -264,21 +276,43 @@ def get_host(name):
     """
     if is_letter(name):
         return name[:-2]
-    if '.' in name:
-        idx = name.rfind('.')
+    idx = name.rfind('.')
+    if idx >= 0:
         return name[:idx]
     return ''
 
 
+@lru_cache(maxsize=32)
+def _catalogs_pattern(catalogs):
+    """
+    Compile a regex matching any of the catalogs prefixes.  The
+    alternation is tried in order, so a match always corresponds
+    to the highest-priority (lowest index) matching catalog.
+    """
+    pattern = re.compile('|'.join(re.escape(catalog) for catalog in catalogs))
+    rank = {}
+    for i,catalog in enumerate(catalogs):
+        rank.setdefault(catalog, i)
+    return pattern, rank
+
+
 def select_alias(aka, catalogs, default_name=None):
     """
     Search alternative names take first one found in catalogs list.
     """
-    for catalog in catalogs:
-        for alias in aka:
-            if alias.startswith(catalog):
-                return alias
-    return default_name
+    if len(catalogs) == 0:
+        return default_name
+    pattern, rank = _catalogs_pattern(tuple(catalogs))
+    selected = default_name
+    best_rank = len(catalogs)
+    for alias in aka:
+        match = pattern.match(alias)
+        if match is not None and rank[match.group()] < best_rank:
+            selected = alias
+            best_rank = rank[match.group()]
+            if best_rank == 0:
+                break
+    return selected
 
 
 def invert_aliases(aliases):
@@ -306,7 +340,8 @@ def as_str(val, fmt='', if_none=None):
     """
     Format as string
     """
-    if val is None or np.isnan(val):
+    # val != val is the NaN check, much cheaper than np.isnan() on scalars
+    if val is None or val != val:
         return if_none
     return f'{val:{fmt}}'
 
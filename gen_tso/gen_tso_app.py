@@ -2460,7 +2460,7 @@ def server(input, output, session):
         # The units tell this function SED or depth spectrum:
         units = uploaded_units.get()
         label, wl, model = read_spectrum_file(
-            new_model[0]['datapath'], on_fail='warning',
+            new_model[0]['datapath'], on_fail='warning', cache=False,
         )
         label = new_model[0]['name']
         if wl is None:
@@ -2470,7 +2470,7 @@ def server(input, output, session):
             ui.notification_show(msg, type="error", duration=5)
             return
 
-        if label.endswith('.dat') or label.endswith('.txt'):
+        if label.endswith(('.dat', '.txt')):
             label = label[0:-4]
 
         if units in depth_units:
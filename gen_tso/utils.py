@@ -12,11 +12,14 @@ __all__ = [
     'pretty_print_target',
 ]
 
+import concurrent.futures
+import hashlib
 import os
+import time
+from functools import lru_cache
 from packaging.version import parse
 
 import numpy as np
-import requests
 from shiny import ui
 
 ROOT = os.path.realpath(os.path.dirname(__file__)) + '/'
@@ -24,7 +27,18 @@ from .catalogs.utils import as_str
 
 
 def check_latest_version(package):
-    response = requests.get(f'https://pypi.org/pypi/{package}/json')
+    # Query PyPI at most once per hour for each package
+    return _check_latest_version(package, int(time.time()//3600))
+
+
+@lru_cache(maxsize=32)
+def _check_latest_version(package, hour):
+    """
+    Fetch latest version of package from PyPI.
+    Memoized by package and hour stamp, see check_latest_version().
+    """
+    import requests
+    response = requests.get(f'https://pypi.org/pypi/{package}/json', timeout=3)
     latest_version = response.json()['info']['version']
     return latest_version
 
@@ -34,6 +48,7 @@ def get_latest_pandeia_versions(package_name='pandeia.engine'):
     Get latest pandeia.engine version for JWST and Roman branches.
     To be checked how new JWST pandeia.engine versions are named.
     """
+    import requests
     url = f"https://pypi.org/pypi/{package_name}/json"
     try:
         response = requests.get(url)
@@ -65,8 +80,8 @@ def get_version_advice(package, latest_version=None):
         latest_version = parse(check_latest_version(name))
     else:
         latest_version = parse(latest_version)
-    my_major_minor = parse(f'{my_version.major}.{my_version.minor}')
-    latest_major_minor = parse(f'{latest_version.major}.{latest_version.minor}')
+    my_major_minor = my_version.major, my_version.minor
+    latest_major_minor = latest_version.major, latest_version.minor
     if my_version == latest_version:
         color = '#0B980D'
         advice = ''
@@ -91,7 +106,91 @@ def get_version_advice(package, latest_version=None):
     return status_advice
 
 
-def read_spectrum_file(file, on_fail=None):
+def _write_atomic(file, write):
+    """
+    Write a (cache) file through a temporary file, so that an
+    interrupted write does not leave a corrupted file behind.
+
+    Parameters
+    ----------
+    file: String
+        Path of the file to write.
+    write: Callable
+        Function that writes the content into an open binary file handle.
+
+    Returns
+    -------
+    success: Bool
+        False if the file could not be written (e.g., a read-only
+        install), in which case any existing file is left untouched.
+    """
+    tmp_file = f'{file}.{os.getpid()}.tmp'
+    try:
+        with open(tmp_file, 'wb') as handle:
+            write(handle)
+        os.replace(tmp_file, file)
+    except OSError:
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
+        return False
+    return True
+
+
+# Parsed spectra from read_spectrum_file(), one file per spectrum file
+_SPECTRA_CACHE_DIR = f'{ROOT}data/spectra_cache/'
+
+
+def _spectrum_cache_key(file):
+    """
+    Get the cache file of a spectrum file and the (modification time,
+    size) stamp of the spectrum file (None if it cannot be accessed).
+    """
+    path = os.path.realpath(file)
+    cache_file = (
+        f'{_SPECTRA_CACHE_DIR}{hashlib.sha1(path.encode()).hexdigest()}.npz'
+    )
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return cache_file, None
+    return cache_file, (stat.st_mtime_ns, stat.st_size)
+
+
+def _load_spectrum_cache(cache_file, stamp):
+    """
+    Load a parsed spectrum from the cache, provided that it was saved
+    for the same spectrum file stamp.  Return None otherwise.
+    """
+    if stamp is None:
+        return None
+    try:
+        with np.load(cache_file) as cache:
+            if tuple(cache['stamp'].tolist()) == stamp:
+                return cache['data']
+    except Exception:
+        # No cache, or an unreadable one (treat as outdated)
+        pass
+    return None
+
+
+def _save_spectrum_cache(cache_file, stamp, data):
+    """
+    Save a parsed spectrum into the cache, tagged with the spectrum
+    file stamp.
+    """
+    if stamp is None:
+        return
+    try:
+        os.makedirs(_SPECTRA_CACHE_DIR, exist_ok=True)
+    except OSError:
+        return
+    _write_atomic(
+        cache_file,
+        lambda handle: np.savez(handle, stamp=np.array(stamp), data=data),
+    )
+
+
+def read_spectrum_file(file, on_fail=None, cache=True):
     """
     Parameters
     ----------
@@ -103,6 +202,10 @@ def read_spectrum_file(file, on_fail=None):
     on_fail: String
         if 'warning' raise a warning.
         if 'error' raise an error.
+    cache: Bool
+        If True, keep the parsed spectrum in a cache file (under
+        gen_tso's data folder), and read from it in following calls
+        (until file is modified).
 
     Examples
     --------
@@ -112,7 +215,15 @@ def read_spectrum_file(file, on_fail=None):
     >>> spectra = u.read_spectrum_file(file, on_fail='warning')
     """
     try:
-        data = np.loadtxt(file, unpack=True)
+        data = None
+        if cache:
+            cache_file, stamp = _spectrum_cache_key(file)
+            data = _load_spectrum_cache(cache_file, stamp)
+        if data is None:
+            # Store as one (2, N) block so that wl and depth are contiguous
+            data = np.ascontiguousarray(np.loadtxt(file, unpack=True))
+            if cache:
+                _save_spectrum_cache(cache_file, stamp, data)
         wl, depth = data
     except ValueError as error:
         wl = None
@@ -126,7 +237,7 @@ def read_spectrum_file(file, on_fail=None):
             raise ValueError(error_msg)
 
     path, label = os.path.split(file)
-    if label.endswith('.dat') or label.endswith('.txt'):
+    if label.endswith(('.dat', '.txt')):
         label = label[0:-4]
     return label, wl, depth
 
@@ -167,58 +278,65 @@ def collect_spectra(folder, on_fail=None):
     >>> folder = f'{u.ROOT}data/models/'
     >>> spectra = u.collect_spectra(folder, on_fail=None)
     """
-    files = os.listdir(folder)
-    transit_files = [
-        file for file in sorted(files)
-        if 'transit' in file or 'transmission' in file
-        if not os.path.isdir(file)
-    ]
-    if 'transit' in files and os.path.isdir('transit'):
-        sub_folder = f'{folder}/transit'
-        transit_files += [
-            f'transit/{file}' for file in sorted(os.listdir(sub_folder))
-            if not os.path.isdir(f'transit/{file}')
-        ]
-
-    eclipse_files = [
-        file for file in sorted(files)
-        if 'eclipse' in file or 'emission' in file
-        if not os.path.isdir(file)
-    ]
-    if 'eclipse' in files and os.path.isdir('eclipse'):
-        sub_folder = f'{folder}/eclipse'
-        eclipse_files += [
-            f'eclipse/{file}' for file in sorted(os.listdir(sub_folder))
-            if not os.path.isdir(f'eclipse/{file}')
-        ]
-
-    sed_files = [
-        file for file in sorted(files)
-        if 'sed' in file or 'star' in file
-        if not os.path.isdir(file)
-    ]
-    if 'sed' in files and os.path.isdir('sed'):
-        sub_folder = f'{folder}/sed'
-        sed_files += [
-            f'sed/{file}' for file in sorted(os.listdir(sub_folder))
-            if not os.path.isdir(f'sed/{file}')
-        ]
+    with os.scandir(folder) as entries:
+        entries = sorted(entries, key=lambda entry: entry.name)
+    # Classify in a single pass, a file may fall into several categories
+    transit_files = []
+    eclipse_files = []
+    sed_files = []
+    sub_dirs = set()
+    for entry in entries:
+        file = entry.name
+        if entry.is_dir():
+            sub_dirs.add(file)
+            continue
+        if 'transit' in file or 'transmission' in file:
+            transit_files.append(file)
+        if 'eclipse' in file or 'emission' in file:
+            eclipse_files.append(file)
+        if 'sed' in file or 'star' in file:
+            sed_files.append(file)
+
+    sub_folders = {
+        'transit': transit_files,
+        'eclipse': eclipse_files,
+        'sed': sed_files,
+    }
+    for sub_name, sub_files in sub_folders.items():
+        if sub_name not in sub_dirs:
+            continue
+        with os.scandir(f'{folder}/{sub_name}') as entries:
+            sub_files += sorted(
+                f'{sub_name}/{entry.name}' for entry in entries
+                if not entry.is_dir()
+            )
+
+    # A file may fall into several categories, but is read only once
+    files = list(dict.fromkeys(transit_files + eclipse_files + sed_files))
+
+    # Read all files concurrently
+    nthreads = max(1, min(8, len(files)))
+    with concurrent.futures.ThreadPoolExecutor(nthreads) as executor:
+        spectra = dict(zip(files, executor.map(
+            lambda file: read_spectrum_file(f'{folder}/{file}', on_fail),
+            files,
+        )))
 
     transit_spectra = {}
     for file in transit_files:
-        label, wl, depth = read_spectrum_file(f'{folder}/{file}', on_fail)
+        label, wl, depth = spectra[file]
         if wl is not None:
             transit_spectra[label] = {'wl': wl, 'depth': depth}
 
     eclipse_spectra = {}
     for file in eclipse_files:
-        label, wl, depth = read_spectrum_file(f'{folder}/{file}', on_fail)
+        label, wl, depth = spectra[file]
         if wl is not None:
             eclipse_spectra[label] = {'wl': wl, 'depth': depth}
 
     sed_spectra = {}
     for file in sed_files:
-        label, wl, model = read_spectrum_file(f'{folder}/{file}', on_fail)
+        label, wl, model = spectra[file]
         if wl is not None:
             sed_spectra[label] = {'wl': wl, 'flux': model}
 
@@ -261,14 +379,9 @@ def format_text(text, warning=False, danger=False, format=None):
     >>> danger1 = u.format_text(text, danger=True, format='html')
     >>> danger2 = u.format_text(text, warning=True, danger=True, format='html')
     """
-    status = 'normal'
-    if danger:
-        status = 'danger'
-    elif warning:
-        status = 'warning'
-
-    if format is None or status=='normal':
+    if format is None or not (danger or warning):
         return text
+    status = 'danger' if danger else 'warning'
 
     if format == 'html':
         text_value = f'<span class="{status}">{text}</span>'
@@ -277,62 +390,89 @@ def format_text(text, warning=False, danger=False, format=None):
     return text_value
 
 
+# Target properties shown by pretty_print_target() and their formats
+_PLANET_FIELDS = (
+    ('rplanet', '.3f'),
+    ('mplanet', '.3f'),
+    ('sma', '.3f'),
+    ('rprs', '.3f'),
+    ('ars', '.3f'),
+    ('period', '.3f'),
+    ('transit_dur', '.3f'),
+    ('eq_temp', '.1f'),
+)
+_STAR_FIELDS = (
+    ('rstar', '.3f'),
+    ('mstar', '.3f'),
+    ('logg_star', '.2f'),
+    ('metal_star', '.2f'),
+    ('teff', '.1f'),
+    ('ks_mag', '.2f'),
+)
+
+_PLANET_TEMPLATE = (
+    'planet = {planet} <br>'
+    'is_transiting = {is_transiting}<br>'
+    'status = {status} planet<br><br>'
+    "rplanet = {rplanet} r_earth<br>"
+    "{mplanet_label} = {mplanet} m_earth<br>"
+    "semi-major axis = {sma} AU<br>"
+    "period = {period} d<br>"
+    "equilibrium temp = {eq_temp} K<br>"
+    "transit_dur (T14) = {transit_dur} h<br>"
+    "rplanet/rstar = {rprs}<br>"
+    "a/rstar = {ars}<br>"
+)
+
+_STAR_TEMPLATE = (
+    'host = {host}<br>'
+    'is JWST host = {is_jwst}<br>'
+    '<br><br>'
+    "rstar = {rstar} r_sun<br>"
+    "mstar = {mstar} m_sun<br>"
+    "log_g = {logg_star}<br>"
+    "metallicity = {metal_star}<br>"
+    "effective temp = {teff} K<br>"
+    "Ks_mag = {ks_mag}<br>"
+    "RA = {ra:.3f} deg<br>"
+    "dec = {dec:.3f} deg<br>"
+)
+
+
 def pretty_print_target(target):
     """
     Print a target's info to HTML text.
     Must look pretty.
     """
-    rplanet = as_str(target.rplanet, '.3f', '---')
-    mplanet = as_str(target.mplanet, '.3f', '---')
-    sma = as_str(target.sma, '.3f', '---')
-    rprs = as_str(target.rprs, '.3f', '---')
-    ars = as_str(target.ars, '.3f', '---')
-    period = as_str(target.period, '.3f', '---')
-    t_dur = as_str(target.transit_dur, '.3f', '---')
-    eq_temp = as_str(target.eq_temp, '.1f', '---')
-
-    rstar = as_str(target.rstar, '.3f', '---')
-    mstar = as_str(target.mstar, '.3f', '---')
-    logg = as_str(target.logg_star, '.2f', '---')
-    metal = as_str(target.metal_star, '.2f', '---')
-    teff = as_str(target.teff, '.1f', '---')
-    ks_mag = as_str(target.ks_mag, '.2f', '---')
-
-    status = 'confirmed' if target.is_confirmed else 'candidate'
-    mplanet_label = 'M*sin(i)' if target.is_min_mass else 'mplanet'
+    planet_values = {
+        field: as_str(getattr(target, field), fmt, '---')
+        for field,fmt in _PLANET_FIELDS
+    }
+    planet_values['planet'] = target.planet
+    planet_values['is_transiting'] = target.is_transiting
+    planet_values['status'] = (
+        'confirmed' if target.is_confirmed else 'candidate'
+    )
+    planet_values['mplanet_label'] = (
+        'M*sin(i)' if target.is_min_mass else 'mplanet'
+    )
+
+    star_values = {
+        field: as_str(getattr(target, field), fmt, '---')
+        for field,fmt in _STAR_FIELDS
+    }
+    star_values['host'] = target.host
+    star_values['is_jwst'] = target.is_jwst
+    star_values['ra'] = target.ra
+    star_values['dec'] = target.dec
+
     if len(target.aliases) > 0:
         aliases = f'aliases = {target.aliases}'
     else:
         aliases = ''
 
-    planet_info = ui.HTML(
-        f'planet = {target.planet} <br>'
-        f'is_transiting = {target.is_transiting}<br>'
-        f'status = {status} planet<br><br>'
-        f"rplanet = {rplanet} r_earth<br>"
-        f"{mplanet_label} = {mplanet} m_earth<br>"
-        f"semi-major axis = {sma} AU<br>"
-        f"period = {period} d<br>"
-        f"equilibrium temp = {eq_temp} K<br>"
-        f"transit_dur (T14) = {t_dur} h<br>"
-        f"rplanet/rstar = {rprs}<br>"
-        f"a/rstar = {ars}<br>"
-    )
-
-    star_info = ui.HTML(
-        f'host = {target.host}<br>'
-        f'is JWST host = {target.is_jwst}<br>'
-        f'<br><br>'
-        f"rstar = {rstar} r_sun<br>"
-        f"mstar = {mstar} m_sun<br>"
-        f"log_g = {logg}<br>"
-        f"metallicity = {metal}<br>"
-        f"effective temp = {teff} K<br>"
-        f"Ks_mag = {ks_mag}<br>"
-        f"RA = {target.ra:.3f} deg<br>"
-        f"dec = {target.dec:.3f} deg<br>"
-    )
-
+    planet_info = ui.HTML(_PLANET_TEMPLATE.format_map(planet_values))
+    star_info = ui.HTML(_STAR_TEMPLATE.format_map(star_values))
     return planet_info, star_info, aliases
 
 
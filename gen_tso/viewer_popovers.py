@@ -36,11 +36,42 @@ tso_choices = {
 }
 
 
+# Popover trigger (shared, Tag objects are not modified when rendered)
+gear_icon = ui.span(
+    fa.icon_svg("gear"),
+    style="position:absolute; top: 5px; right: 7px;",
+)
+
+
+def wl_input(input_id, value, min_value, step):
+    """
+    Numeric input for a wavelength boundary of a plot (no label,
+    up to 30.0 microns).
+
+    Parameters
+    ----------
+    input_id: String
+        The input's ID.
+    value: Float
+        Initial wavelength value (microns), can be None.
+    min_value: Float
+        Minimum allowed wavelength (microns).
+    step: Float
+        Interval between wavelength values.
+
+    Returns
+    -------
+    input: shiny Tag
+        A ui.input_numeric() input.
+    """
+    return ui.input_numeric(
+        id=input_id, label='',
+        value=value, min=min_value, max=30.0, step=step,
+    )
+
+
 filter_popover = ui.popover(
-    ui.span(
-        fa.icon_svg("gear"),
-        style="position:absolute; top: 5px; right: 7px;",
-    ),
+    gear_icon,
     "Show filter throughputs",
     ui.input_radio_buttons(
         id="filter_filter",
@@ -54,10 +85,7 @@ filter_popover = ui.popover(
 
 
 sed_popover = ui.popover(
-    ui.span(
-        fa.icon_svg("gear"),
-        style="position:absolute; top: 5px; right: 7px;",
-    ),
+    gear_icon,
     ui.layout_column_wrap(
         ui.input_numeric(
             id='plot_sed_resolution',
@@ -80,14 +108,8 @@ sed_popover = ui.popover(
     ),
     ui.layout_column_wrap(
         "Wavelength:",
-        ui.input_numeric(
-            id='sed_wl_min', label='',
-            value=0.45, min=0.3, max=30.0, step=0.15,
-        ),
-        ui.input_numeric(
-            id='sed_wl_max', label='',
-            value=28.0, min=0.5, max=30.0, step=1.0,
-        ),
+        wl_input('sed_wl_min', value=0.45, min_value=0.3, step=0.15),
+        wl_input('sed_wl_max', value=28.0, min_value=0.5, step=1.0),
         ui.input_select(
             id="plot_sed_xscale",
             label="",
@@ -107,10 +129,7 @@ sed_popover = ui.popover(
 
 
 planet_popover = ui.popover(
-    ui.span(
-        fa.icon_svg("gear"),
-        style="position:absolute; top: 5px; right: 7px;",
-    ),
+    gear_icon,
     ui.layout_column_wrap(
         ui.input_numeric(
             id='depth_resolution',
@@ -133,14 +152,8 @@ planet_popover = ui.popover(
     ),
     ui.layout_column_wrap(
         "Wavelength:",
-        ui.input_numeric(
-            id='depth_wl_min', label='',
-            value=0.6, min=0.3, max=30.0, step=0.15,
-        ),
-        ui.input_numeric(
-            id='depth_wl_max', label='',
-            value=28.0, min=0.5, max=30.0, step=1.0,
-        ),
+        wl_input('depth_wl_min', value=0.6, min_value=0.3, step=0.15),
+        wl_input('depth_wl_max', value=28.0, min_value=0.5, step=1.0),
         ui.input_select(
             "plot_depth_xscale",
             label="",
@@ -160,10 +173,7 @@ planet_popover = ui.popover(
 
 
 tso_popover = ui.popover(
-    ui.span(
-        fa.icon_svg("gear"),
-        style="position:absolute; top: 5px; right: 7px;",
-    ),
+    gear_icon,
     ui.layout_column_wrap(
         ui.input_select(
             id="tso_plot",
@@ -209,14 +219,8 @@ tso_popover = ui.popover(
     ),
     ui.layout_column_wrap(
         "Wavelength:",
-        ui.input_numeric(
-            id='tso_wl_min', label='',
-            value=None, min=0.5, max=30.0, step=0.1,
-        ),
-        ui.input_numeric(
-            id='tso_wl_max', label='',
-            value=None, min=0.5, max=30.0, step=0.1,
-        ),
+        wl_input('tso_wl_min', value=None, min_value=0.5, step=0.1),
+        wl_input('tso_wl_max', value=None, min_value=0.5, step=0.1),
         ui.input_select(
             id="plot_tso_xscale",
             label='',
@@ -1,6 +1,11 @@
+import os
+import shutil
 import pytest
 import gen_tso.catalogs as cat
+import gen_tso.catalogs.catalogs as catalogs
+import gen_tso.catalogs.fetch_catalogs as fetch
 import numpy as np
+from astropy.table import Table, MaskedColumn
 from gen_tso.utils import ROOT
 
 
@@ -115,3 +120,110 @@ def test_fetch_gaia_targets():
 def test_fetch_gaia_targets_error():
     pass
 
+
+def test_catalog_cache(tmp_path, monkeypatch):
+    # Work on a copy of the catalog files
+    data = tmp_path / 'data'
+    data.mkdir()
+    for file in catalogs._CATALOG_SOURCES:
+        shutil.copy(f'{ROOT}data/{file}', data / file)
+    cache_file = str(data / 'catalog_cache.pickle')
+    monkeypatch.setattr(catalogs, 'ROOT', f'{tmp_path}/')
+    monkeypatch.setattr(catalogs, '_CATALOG_CACHE', cache_file)
+
+    n_parse = []
+    parse_catalog = catalogs._parse_catalog
+    def counted_parse():
+        n_parse.append(1)
+        return parse_catalog()
+    monkeypatch.setattr(catalogs, '_parse_catalog', counted_parse)
+
+    # Cold start parses the files and writes the cache
+    cold = cat.Catalog()
+    assert len(n_parse) == 1
+    assert os.path.exists(cache_file)
+
+    # Warm start loads the same data from the cache
+    warm = cat.Catalog()
+    assert len(n_parse) == 1
+    assert [t.planet for t in warm.targets] == [t.planet for t in cold.targets]
+    np.testing.assert_equal(warm._transit_mask, cold._transit_mask)
+    np.testing.assert_equal(warm._jwst_mask, cold._jwst_mask)
+    np.testing.assert_equal(warm._confirmed_mask, cold._confirmed_mask)
+
+    # Modifying any source file invalidates the cache
+    for i,file in enumerate(catalogs._CATALOG_SOURCES):
+        stat = os.stat(data / file)
+        os.utime(data / file, (stat.st_atime, stat.st_mtime + 10.0))
+        cat.Catalog()
+        assert len(n_parse) == 2 + i
+
+
+# Simbad entries for the mocked query_objects() below
+simbad_entries = {
+    'WASP-69': ('PM*', 'WASP-69|TOI-5823|2MASS J21000618-0505398', 7.46),
+    'WASP-69b': ('Pl', 'WASP-69b|TOI-5823.01', np.nan),
+}
+
+
+def mock_query_objects(names):
+    """Simbad.query_objects() output format of astroquery >= 0.4.8"""
+    entries = [simbad_entries.get(name, ('', '', np.nan)) for name in names]
+    found = [name in simbad_entries for name in names]
+    return Table({
+        'main_id': MaskedColumn(
+            [name if hit else '' for name,hit in zip(names,found)],
+            mask=np.logical_not(found),
+        ),
+        'otype': [entry[0] for entry in entries],
+        'ids': [entry[1] for entry in entries],
+        'K': MaskedColumn(
+            [entry[2] for entry in entries],
+            mask=np.isnan([entry[2] for entry in entries]),
+        ),
+        'user_specified_id': names,
+        'object_number_id': np.arange(1, len(names)+1),
+    })
+
+
+def mock_legacy_query_objects(names):
+    """Simbad.query_objects() output format of astroquery < 0.4.8"""
+    index = [i for i,name in enumerate(names) if name in simbad_entries]
+    entries = [simbad_entries[names[i]] for i in index]
+    otypes = {'PM*': 'HighPM*', 'Pl': 'Planet'}
+    return Table({
+        'MAIN_ID': [names[i] for i in index],
+        'OTYPE': [otypes[entry[0]] for entry in entries],
+        'IDS': [entry[1] for entry in entries],
+        'FLUX_K': MaskedColumn(
+            [entry[2] for entry in entries],
+            mask=np.isnan([entry[2] for entry in entries]),
+        ),
+        'SCRIPT_NUMBER_ID': [i+1 for i in index],
+    })
+
+
+@pytest.mark.parametrize(
+    'query_objects', [mock_query_objects, mock_legacy_query_objects],
+)
+def test_query_simbad_objects(monkeypatch, query_objects):
+    monkeypatch.setattr(fetch.simbad, 'query_objects', query_objects)
+    rows = fetch._query_simbad_objects(['WASP-999', 'WASP-69', 'WASP-69b'])
+    assert list(rows) == ['WASP-69', 'WASP-69b']
+    assert 'PM*' in str(rows['WASP-69']['OTYPE'])
+    assert str(rows['WASP-69b']['IDS']) == 'WASP-69b|TOI-5823.01'
+    assert rows['WASP-69']['FLUX_K'] == 7.46
+    assert np.ma.is_masked(rows['WASP-69b']['FLUX_K'])
+
+
+@pytest.mark.parametrize(
+    'query_objects', [mock_query_objects, mock_legacy_query_objects],
+)
+def test_fetch_simbad_aliases_batch(monkeypatch, query_objects):
+    monkeypatch.setattr(fetch, '_set_simbad_fields', lambda: None)
+    monkeypatch.setattr(fetch.simbad, 'query_objects', query_objects)
+    targets = ['WASP-69b', 'WASP-999', 'WASP-69']
+    aliases, kmags = fetch.fetch_simbad_aliases_batch(targets, verbose=False)
+    host_aliases = ['WASP-69', 'TOI-5823', '2MASS J21000618-0505398']
+    assert aliases == [host_aliases, [], host_aliases]
+    np.testing.assert_equal(kmags, [7.46, np.nan, 7.46])
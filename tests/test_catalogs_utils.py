@@ -64,3 +64,34 @@ def test_get_trexolists_targets_group_coords():
     np.testing.assert_equal(ra, expected_ra)
     np.testing.assert_equal(dec, expected_dec)
 
+
+def test_is_letter():
+    assert u.is_letter('WASP-69 b')
+    assert not u.is_letter('TOI-741.01')
+    assert not u.is_letter('WASP-69')
+
+
+def test_is_letter_short_names():
+    assert not u.is_letter('')
+    assert not u.is_letter('b')
+    assert u.is_letter(' b')
+
+
+def test_is_candidate():
+    assert u.is_candidate('TOI-741.01')
+    assert not u.is_candidate('WASP-69 b')
+    assert not u.is_candidate('.1')
+
+
+def test_select_alias():
+    aka = ['TIC 1234', 'Gaia DR2 5678', '2MASS J0102', 'TOI-1234']
+    catalogs = ['2MASS', 'Gaia DR3', 'Gaia DR2', 'TOI']
+    assert u.select_alias(aka, catalogs) == '2MASS J0102'
+    assert u.select_alias(aka, ['Gaia DR3', 'TOI']) == 'TOI-1234'
+
+
+def test_select_alias_default():
+    aka = ['TIC 1234', 'TOI-1234']
+    assert u.select_alias(aka, ['2MASS', 'Gaia DR3']) is None
+    assert u.select_alias(aka, ['2MASS'], 'TOI-1234') == 'TOI-1234'
+    assert u.select_alias(aka, [], 'TIC 1234') == 'TIC 1234'
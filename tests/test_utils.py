@@ -1,6 +1,8 @@
 # Copyright (c) 2025 Patricio Cubillos
 # Gen TSO is open-source software under the GPL-2.0 license (see LICENSE)
  
+import os
+import numpy as np
 import gen_tso.utils as u
 from prompt_toolkit.formatted_text import FormattedText
 
@@ -63,6 +65,46 @@ def test_read_spectrum_file_success():
     pass
 
 
+def test_read_spectrum_file_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(u, '_SPECTRA_CACHE_DIR', f'{tmp_path}/cache/')
+    file = f'{u.ROOT}data/models/WASP80b_transit.dat'
+    tmp_file = tmp_path / 'WASP80b_transit.dat'
+    tmp_file.write_text(open(file).read())
+    label, wl, depth = u.read_spectrum_file(str(tmp_file))
+    assert len(os.listdir(tmp_path / 'cache')) == 1
+    assert sorted(os.listdir(tmp_path)) == ['WASP80b_transit.dat', 'cache']
+    cached_label, cached_wl, cached_depth = u.read_spectrum_file(str(tmp_file))
+    expected_wl, expected_depth = np.loadtxt(file, unpack=True)
+    assert cached_label == label == 'WASP80b_transit'
+    np.testing.assert_array_equal(cached_wl, expected_wl)
+    np.testing.assert_array_equal(cached_depth, expected_depth)
+
+
+def test_read_spectrum_file_cache_corrupted(tmp_path, monkeypatch):
+    monkeypatch.setattr(u, '_SPECTRA_CACHE_DIR', f'{tmp_path}/cache/')
+    tmp_file = tmp_path / 'a_transit.dat'
+    tmp_file.write_text('1.0 0.1\n2.0 0.2\n')
+    u.read_spectrum_file(str(tmp_file))
+    # Truncate the cache file, as if a write had been interrupted
+    cache_file = tmp_path / 'cache' / os.listdir(tmp_path / 'cache')[0]
+    cache_file.write_bytes(b'')
+    label, wl, depth = u.read_spectrum_file(str(tmp_file))
+    np.testing.assert_array_equal(depth, [0.1, 0.2])
+
+
+def test_read_spectrum_file_cache_older_replacement(tmp_path, monkeypatch):
+    monkeypatch.setattr(u, '_SPECTRA_CACHE_DIR', f'{tmp_path}/cache/')
+    tmp_file = tmp_path / 'a_transit.dat'
+    tmp_file.write_text('1.0 0.1\n2.0 0.2\n')
+    u.read_spectrum_file(str(tmp_file))
+    # Replace with a different file having an older modification time
+    tmp_file.write_text('1.0 0.5\n2.0 0.6\n')
+    stat = os.stat(tmp_file)
+    os.utime(tmp_file, (stat.st_atime, stat.st_mtime - 3600.0))
+    label, wl, depth = u.read_spectrum_file(str(tmp_file))
+    np.testing.assert_array_equal(depth, [0.5, 0.6])
+
+
 def test_read_spectrum_file_fail_none():
     pass
 